@@ -0,0 +1,106 @@
+"""Import time benchmark module
+
+Measures the cold start of an API worker in fresh interpreters:
+  - module import cost reported by `python -X importtime`
+  - peak RSS after importing the app (idle memory per worker)
+  - time-to-first-request, including the startup hook
+
+Run from the root of the project:
+    python benchmarks/import_time.py [--top 20] [--runs 5]
+"""
+
+# Standard library imports
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_MODULE = "src.app.main"
+
+IMPORT_SCRIPT = f"""
+import resource
+import {APP_MODULE}
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+FIRST_REQUEST_SCRIPT = f"""
+import time
+start = time.perf_counter()
+from fastapi.testclient import TestClient
+from {APP_MODULE} import app
+with TestClient(app) as client:
+    client.get("/run/exec-rule-performance-metrics")
+    print(time.perf_counter() - start)
+"""
+
+
+def _run_python(args):
+    """
+    Run a fresh interpreter from the project root.
+
+    :param args: Interpreter arguments.
+    :return: The completed process.
+    """
+    return subprocess.run([sys.executable, *args], cwd=PROJECT_ROOT, capture_output=True,
+                          text=True, check=True)
+
+
+def parse_importtime(stderr):
+    """
+    Parse the output of `python -X importtime`.
+
+    :param stderr: The interpreter's stderr.
+    :return: List of (module, self_us, cumulative_us) tuples.
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def measure_imports(top):
+    """
+    Report the slowest imports of the app module.
+
+    :param top: Number of modules to report.
+    """
+    process = _run_python(["-X", "importtime", "-c", IMPORT_SCRIPT])
+    modules = parse_importtime(process.stderr)
+
+    print(f"Import of {APP_MODULE}: {sum(m[1] for m in modules) / 1000:.1f} ms total")
+    print(f"Peak RSS after import: {int(process.stdout.split()[-1]) / 1024:.1f} MB")
+    print(f"Top {top} modules by cumulative import time:")
+    for name, _, cumulative_us in sorted(modules, key=lambda m: m[2], reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:10.1f} ms  {name}")
+
+
+def measure_first_request(runs):
+    """
+    Report the time from interpreter start to the first served request.
+
+    :param runs: Number of fresh interpreters to measure.
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        _run_python(["-c", FIRST_REQUEST_SCRIPT])
+        timings.append(time.perf_counter() - start)
+
+    print(f"Time-to-first-request over {runs} runs: "
+          f"median {statistics.median(timings) * 1000:.1f} ms, max {max(timings) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the API worker cold start.")
+    parser.add_argument("--top", type=int, default=20, help="Number of modules to report.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of time-to-first-request runs.")
+    arguments = parser.parse_args()
+
+    measure_imports(arguments.top)
+    measure_first_request(arguments.runs)
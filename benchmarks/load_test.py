@@ -0,0 +1,224 @@
+"""Load test module
+
+Drives the rule engine API at increasing concurrency and reports throughput and tail
+latency per level, mixing scheduler-like runs of /run/exec-rule-engine with
+dashboard-like reads of /run/exec-rule-performance-metrics.
+
+The ASGI app is driven in-process by default. Pass --url to target a running server:
+    uvicorn src.app.main:app --port 8000
+    python benchmarks/load_test.py --url http://localhost:8000
+
+With --stub the data layer is replaced by generated facts and rules, with a simulated
+blocking query latency, so no PostgreSQL database is needed (in-process mode only):
+    python benchmarks/load_test.py --stub --concurrency 1,2,4,8,16,32
+"""
+
+# Standard library imports
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+# Third-party library imports
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ENGINE_PATH = "/run/exec-rule-engine"
+METRICS_PATH = "/run/exec-rule-performance-metrics"
+
+FIELDS = ["impressions_delivered", "impression_goal", "priority_level", "pacing_osi"]
+OPERATORS = ["==", "!=", ">", "<"]
+
+
+def generate_facts(count):
+    """
+    Generate line item facts shaped like the seed data of create_populate_data_model.sql.
+
+    :param count: Number of facts.
+    :return: List of fact dictionaries.
+    """
+    return [{
+        "campaign_id": i % 100 + 1,
+        "campaign_name": f"Campaign {i % 100 + 1}",
+        "id": i,
+        "order_id": i % 50 + 1,
+        "type": "Sponsorship" if i % 2 == 0 else "Standard",
+        "impressions_delivered": (i * 500) % 50000,
+        "impression_goal": (i * 1000) % 100000,
+        "priority_level": i % 10 + 1,
+        "delivery_type": "Even" if i % 2 == 0 else "AFAP",
+        "pacing_osi": float(i % 100),
+    } for i in range(1, count + 1)]
+
+
+def generate_rules(count):
+    """
+    Generate rule definitions shaped like the seed data of create_populate_data_model.sql.
+
+    :param count: Number of rules.
+    :return: List of rule_definitions rows.
+    """
+    # Seeded, so every run gets the same rules, as when they are read from the database
+    rng = random.Random(count)
+    rules = []
+    for i in range(1, count + 1):
+        target_field = rng.choice(FIELDS)
+        rules.append({
+            "id": i,
+            "type": f"Rule {i}",
+            "rule": {
+                "name": f"load_test_{i}",
+                "priority": rng.randint(0, 9),
+                "condition": {
+                    rng.choice(["all", "any"]): [
+                        {"field": rng.choice(FIELDS), "operator": rng.choice(OPERATORS),
+                         "value": rng.randint(0, 99)}
+                        for _ in range(2)
+                    ]
+                },
+                "actions": [
+                    {"type": "update", "target_field": target_field, "expression": f"{target_field} + 1"},
+                    {"type": "alert", "message": f"Rule {i} fired"},
+                ],
+            },
+        })
+    return rules
+
+
+def install_stub_data_layer(facts, rules, latency):
+    """
+    Replace the router's database fetches with generated data.
+
+    :param facts: Number of facts returned per run.
+    :param rules: Number of rules returned per run.
+    :param latency: Seconds each fetch blocks, like a synchronous psycopg2 query.
+    """
+    from src.app.model.fact import load_facts
+    from src.app.router import rules_engine_api
+
+    def load_data():
+        time.sleep(latency)
+        return load_facts(generate_facts(facts))
+
+    def load_rules():
+        time.sleep(latency)
+        return rules_engine_api._validate_rules(generate_rules(rules))  # pylint: disable=protected-access
+
+    rules_engine_api._load_data_from_local_database = load_data  # pylint: disable=protected-access
+    rules_engine_api._load_rules_from_local_database = load_rules  # pylint: disable=protected-access
+
+
+def percentile(values, fraction):
+    """
+    Nearest-rank percentile.
+
+    :param values: Sorted values.
+    :param fraction: Percentile as a fraction (0.95 for p95).
+    :return: The percentile value.
+    """
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def run_level(client, concurrency, requests, metrics_ratio):
+    """
+    Send `requests` requests with `concurrency` concurrent workers.
+
+    :param client: The HTTP client.
+    :param concurrency: Number of concurrent workers.
+    :param requests: Total number of requests.
+    :param metrics_ratio: Fraction of requests sent to the metrics endpoint.
+    :return: Dictionary with the level results.
+    """
+    paths = [METRICS_PATH if random.random() < metrics_ratio else ENGINE_PATH for _ in range(requests)]
+    latencies = {ENGINE_PATH: [], METRICS_PATH: []}
+    statuses = {}
+
+    async def worker():
+        while paths:
+            path = paths.pop()
+            start = time.perf_counter()
+            try:
+                status = (await client.get(path)).status_code
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies[path].append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+
+    return {"concurrency": concurrency, "elapsed": elapsed, "requests": requests,
+            "latencies": latencies, "statuses": statuses}
+
+
+def report(result):
+    """
+    Print the results of one concurrency level.
+
+    :param result: Dictionary returned by run_level.
+    """
+    print(f"concurrency={result['concurrency']:<4} "
+          f"throughput={result['requests'] / result['elapsed']:8.1f} req/s  statuses={result['statuses']}")
+    for path, latencies in result["latencies"].items():
+        if not latencies:
+            continue
+        latencies.sort()
+        print(f"    {path:<36} n={len(latencies):<5} "
+              f"p50={statistics.median(latencies) * 1000:8.1f} ms  "
+              f"p95={percentile(latencies, 0.95) * 1000:8.1f} ms  "
+              f"p99={percentile(latencies, 0.99) * 1000:8.1f} ms  "
+              f"max={latencies[-1] * 1000:8.1f} ms")
+
+
+async def main(arguments):
+    """
+    Run the load test at each concurrency level.
+
+    :param arguments: Parsed command line arguments.
+    """
+    if arguments.url:
+        client = httpx.AsyncClient(base_url=arguments.url, timeout=arguments.timeout)
+    else:
+        if arguments.stub:
+            install_stub_data_layer(arguments.facts, arguments.rules, arguments.stub_latency)
+        from src.app.main import app
+        from src.app.router.rules_engine_api import warm_up, shut_down
+
+        # ASGITransport does not run the lifespan hooks
+        if not arguments.stub:
+            warm_up()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test",
+                                   timeout=arguments.timeout)
+
+    try:
+        for concurrency in arguments.concurrency:
+            report(await run_level(client, concurrency, arguments.requests, arguments.metrics_ratio))
+    finally:
+        await client.aclose()
+        if not arguments.url:
+            await shut_down()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the rule engine API.")
+    parser.add_argument("--url", help="Base URL of a running server, defaults to driving the app in-process.")
+    parser.add_argument("--stub", action="store_true", help="Replace the database with generated data.")
+    parser.add_argument("--facts", type=int, default=1000, help="Facts per run with --stub.")
+    parser.add_argument("--rules", type=int, default=20, help="Rules per run with --stub.")
+    parser.add_argument("--stub-latency", type=float, default=0.05, help="Seconds per fetch with --stub.")
+    parser.add_argument("--concurrency", type=lambda v: [int(c) for c in v.split(",")], default=[1, 2, 4, 8, 16],
+                        help="Comma separated concurrency levels.")
+    parser.add_argument("--requests", type=int, default=64, help="Requests per concurrency level.")
+    parser.add_argument("--metrics-ratio", type=float, default=0.5,
+                        help="Fraction of requests sent to the metrics endpoint.")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Request timeout in seconds.")
+    args = parser.parse_args()
+
+    if args.stub and args.url:
+        parser.error("--stub only applies to the in-process mode")
+    asyncio.run(main(args))
@@ -2,9 +2,10 @@
 
 # Third-party library imports
 # pylint: disable=unused-import,import-error,wildcard-import,broad-exception-caught
+from contextlib import asynccontextmanager
 from ..shared_utils.utils import get_logger
 from ..shared_utils.base_app import create_app
-from .router.rules_engine_api import router as rule_engine_router
+from .router.rules_engine_api import router as rule_engine_router, warm_up, shut_down
 
 # Service name
 SERVICE_NAME = "app"
@@ -12,8 +13,17 @@ SERVICE_NAME = "app"
 # Configure logging
 logger = get_logger(SERVICE_NAME)
 
+@asynccontextmanager
+async def lifespan(_app):
+    """
+    Run the warm-up before serving the first request and release resources on shutdown.
+    """
+    warm_up()
+    yield
+    await shut_down()
+
 # Create the Fast app
-app = create_app(SERVICE_NAME)
+app = create_app(SERVICE_NAME, lifespan=lifespan)
 
 # Mount the GraphQL app
 app.include_router(rule_engine_router, prefix="/run", tags=["Rule Engine"])
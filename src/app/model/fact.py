@@ -0,0 +1,39 @@
+"""Fact module"""
+
+# Third-party library imports
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+
+
+class Fact(BaseModel):
+    # Extra fields (aggregates, fields written by update actions) are kept as-is
+    model_config = ConfigDict(extra='allow')
+
+    id: int
+    campaign_id: int
+    campaign_name: str = ''
+    order_id: Optional[int] = None
+    type: Optional[str] = None
+    impressions_delivered: Optional[int] = None
+    impression_goal: Optional[int] = None
+    priority_level: Optional[int] = None
+    delivery_type: Optional[str] = None
+    pacing_osi: Optional[float] = None
+
+
+# Compiled validator for fact sets
+FACTS_ADAPTER = TypeAdapter(List[Fact])
+
+
+def load_facts(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Validate raw records once and return JSON-compatible fact dictionaries.
+
+    Args:
+        records: Records as fetched from the database.
+
+    Returns:
+        List of validated facts.
+    """
+    return [fact.model_dump() for fact in FACTS_ADAPTER.validate_python(records)]
+
@@ -0,0 +1,85 @@
+"""Rule module"""
+
+# Third-party library imports
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+
+class Condition(BaseModel):
+    field: str
+    operator: Literal['==', '!=', '<', '>', '<=', '>=']
+    value: Any
+
+
+class RuleCondition(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    all_: Optional[List[Condition]] = Field(default=None, alias='all', min_length=1)
+    any_: Optional[List[Condition]] = Field(default=None, alias='any', min_length=1)
+
+    @model_validator(mode='after')
+    def check_one_group(self):
+        # Exactly one of 'all' or 'any' must be given
+        if (self.all_ is None) == (self.any_ is None):
+            raise ValueError("Condition must define exactly one of 'all' or 'any'")
+        return self
+
+
+class Action(BaseModel):
+    type: Literal['update', 'redistribute', 'alert', 'notify']
+    target_field: Optional[str] = None
+    expression: Optional[str] = None
+    params: Optional[Dict[str, Any]] = None
+    message: Optional[str] = None
+    recipient: Optional[str] = None
+    template: Optional[str] = None
+
+    @model_validator(mode='after')
+    def check_required_fields(self):
+        required = {
+            'update': ('target_field', 'expression'),
+            'redistribute': ('params',),
+            'alert': ('message',),
+            'notify': ('recipient', 'template'),
+        }[self.type]
+        missing = [name for name in required if getattr(self, name) is None]
+        if missing:
+            raise ValueError(f"Action '{self.type}' is missing {missing}")
+
+        # Compile the update expression once so syntax errors surface at load time
+        if self.type == 'update':
+            try:
+                compile(self.expression, '<rule expression>', 'eval')
+            except SyntaxError as e:
+                raise ValueError(f"Invalid update expression '{self.expression}': {e}") from e
+        return self
+
+
+class Aggregate(BaseModel):
+    name: str
+    function: Literal['sum', 'avg', 'min', 'max', 'count']
+    field: Optional[str] = None
+    group_by: Literal['campaign_id', 'order_id']
+
+    @model_validator(mode='after')
+    def check_field(self):
+        if self.function != 'count' and self.field is None:
+            raise ValueError(f"Aggregate '{self.name}' is missing 'field'")
+        return self
+
+
+class RuleDefinition(BaseModel):
+    name: str
+    priority: int = 0
+    condition: RuleCondition
+    actions: List[Action]
+    aggregates: List[Aggregate] = []
+
+    def to_rule(self) -> Dict[str, Any]:
+        """Dump the validated rule back to the JSON structure used by the RulesRunner."""
+        # exclude_unset keeps explicit nulls, such as a condition comparing a field to null
+        rule = self.model_dump(by_alias=True, exclude_unset=True)
+        # Keep only the condition group in use, even if the other one was given as null
+        rule['condition'] = {group: conds for group, conds in rule['condition'].items() if conds is not None}
+        return rule
+
@@ -1,12 +1,21 @@
 # Standard library imports
+import asyncio
+import os
 import time
+from typing import Literal
 
 # Third-party library imports
 from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
 from src.shared_utils.utils import get_logger
 from src.shared_utils.response_handler import ResponseHandler
-from src.shared_utils.local_db import LocalDatabase
-from ..utils.rules_runner import RulesRunner
+from src.shared_utils.config import get_config
+from src.shared_utils.tracer import tracer
+from src.shared_utils.sampling_profiler import SamplingProfiler
+from src.shared_utils.admission_control import AdmissionController, AdmissionRejected
+from ..model.fact import load_facts
+from ..model.rule import RuleDefinition
 from ..utils.rules_performance_metrics import RulesPerformanceMetrics
 
 # Configure logging
@@ -14,40 +23,110 @@ logger = get_logger("rule-engine-api")
 response_handler = ResponseHandler()
 router = APIRouter()
 
-# Instantiate the RulesPerformanceMetrics class
+# Metrics of the latest finished run; each run records into its own instance
 rules_performance_metrics = RulesPerformanceMetrics()
 
+# Bound the number of concurrent rule engine runs (and so of database connections)
+admission_config = get_config("admission")
+admission_controller = AdmissionController(
+    max_concurrent=admission_config.get("max_concurrent_runs", 4),
+    max_queued=admission_config.get("max_queued_runs", 16),
+    queue_timeout=admission_config.get("queue_timeout_seconds", 30),
+)
+
+def warm_up():
+    """
+    Startup hook: load the configuration, open the database pool and import the rules engine
+    so that the first request does not pay for them.
+    """
+    # Heavy modules are imported here instead of at module import time
+    from src.shared_utils.db_manager import open_connection_pool
+    from ..utils import rules_runner  # pylint: disable=unused-import
+
+    get_config("database")
+    try:
+        # One connection per concurrent run is enough, runs fetch data and rules sequentially
+        open_connection_pool(maxconn=admission_controller.max_concurrent)
+    except Exception as e:
+        # Requests fall back to per-request connections until the database is reachable
+        logger.error(f"Error opening the database connection pool: {e}")
+    logger.info("Rule engine warm-up completed.")
+
+async def shut_down():
+    """
+    Shutdown hook: deliver the pending action digests and close the database pool.
+    """
+    from src.shared_utils.db_manager import close_connection_pool
+    from ..utils.action_dispatcher import action_dispatcher
+
+    await action_dispatcher.drain()
+    close_connection_pool()
+
 @router.get("/exec-rule-engine")
-async def exec_rule_engine(request: Request):
+async def exec_rule_engine(request: Request, profile: bool = False,
+                           profile_format: Literal["collapsed", "speedscope"] = "collapsed"):
     """
     Execute rule engine endpoint. Logs a message and returns a success response.
+
+    With ?profile=true the run is sampled by a SamplingProfiler (5 ms interval, capped at
+    20000 samples) and the response data holds the stacks, in collapsed-stack format or
+    in speedscope format with ?profile_format=speedscope, together with the run's
+    performance metrics.
+
+    At most max_concurrent_runs runs execute at once (see the 'admission' configuration).
+    Further requests queue up to max_queued_runs, and the rest get a 429 response.
+    """
+    try:
+        async with admission_controller.admit():
+            return await _exec_rule_engine_run(request, profile, profile_format)
+    except AdmissionRejected as e:
+        logger.warning(f"Rule engine run rejected: {e}")
+        return JSONResponse(status_code=429, content=response_handler.too_many_requests(message=str(e)))
+
+async def _exec_rule_engine_run(request: Request, profile: bool, profile_format: str):
+    """
+    Execute a single admitted rule engine run.
     """
+    global rules_performance_metrics
+    run_performance_metrics = RulesPerformanceMetrics()
+
+    profiler = None
+    if profile:
+        profiler = SamplingProfiler()
+        profiler.start()
+
+    # Record a Chrome trace of this run when tracing is enabled in the configuration
+    tracing_config = get_config("tracing")
+    trace_token = tracer.start_run() if tracing_config.get("enabled") else None
     try:
         # Record execution details
         execution_details = {
             "endpoint": request.url.path,  # Get the endpoint path dynamically
             "request_time": time.time(),
         }
-        rules_performance_metrics.record_execution_details(execution_details)
+        run_performance_metrics.record_execution_details(execution_details)
 
         # Start timing for data fetching
-        start_time = rules_performance_metrics.start_timer()
-        data = await _fetch_data_from_local_database()
-        rules_performance_metrics.stop_timer(start_time, "data_fetch_time")
+        start_time = run_performance_metrics.start_timer()
+        with tracer.span("fetch_data"):
+            data = await _fetch_data_from_local_database()
+        run_performance_metrics.stop_timer(start_time, "data_fetch_time")
 
         # Start timing for rules fetching
-        start_time = rules_performance_metrics.start_timer()
-        rules = await _fetch_rules_from_local_database()
-        rules_performance_metrics.stop_timer(start_time, "rules_fetch_time")
+        start_time = run_performance_metrics.start_timer()
+        with tracer.span("fetch_rules"):
+            rules = await _fetch_rules_from_local_database()
+        run_performance_metrics.stop_timer(start_time, "rules_fetch_time")
 
         # Run the rules engine asynchronously
-        await _run_rules_engine_async(data, rules)
+        with tracer.span("evaluate_rules", facts=len(data), rules=len(rules)):
+            await _run_rules_engine_async(data, rules, run_performance_metrics)
 
-        # Record CPU and memory usage
-        rules_performance_metrics.record_cpu_and_memory_usage()
+        # Record CPU and memory usage (sampled over one second, so off the event loop)
+        await asyncio.to_thread(run_performance_metrics.record_cpu_and_memory_usage)
 
         # Record system-level metrics
-        rules_performance_metrics.record_system_metrics()
+        await asyncio.to_thread(run_performance_metrics.record_system_metrics)
 
         message = "Rules evaluation completed successfully."
         logger.info(message)
@@ -66,21 +145,57 @@ async def exec_rule_engine(request: Request):
         logger.error(message)
         return message
     finally:
+        if trace_token is not None:
+            trace_path = os.path.join(tracing_config.get("output_dir", "traces"),
+                                      f"rule-engine-{time.time_ns()}.json")
+            try:
+                tracer.finish_run(trace_token, trace_path)
+                logger.info(f"Trace written to {trace_path}")
+            except Exception as e:
+                # A failed export must not cost the run its response or leave the profiler running
+                logger.error(f"Error writing trace to {trace_path}: {e}")
+
+        rules_performance_metrics = run_performance_metrics
+
+        response_data = None
+        if profiler is not None:
+            profiler.stop()
+            response_data = {
+                "performance_metrics": run_performance_metrics.get_performance_metrics(),
+                "profile": {
+                    **profiler.get_summary(),
+                    "format": profile_format,
+                    "stacks": profiler.speedscope() if profile_format == "speedscope" else profiler.collapsed(),
+                },
+            }
+
         message = "Rules evaluation process finished, whether successful or not."
         logger.info(message)
-        return response_handler.success(message=message)
+        return response_handler.success(data=response_data, message=message)
 
 @router.get("/exec-rule-performance-metrics")
 def get_rule_performance_metrics():
     """
-    Retrieve performance metrics for the rule engine execution.
+    Retrieve performance metrics for the latest rule engine execution.
     """
-    return rules_performance_metrics.get_performance_metrics()
+    return {
+        **rules_performance_metrics.get_performance_metrics(),
+        "admission": admission_controller.get_status(),
+    }
 
 async def _fetch_data_from_local_database():
+    """
+    Fetch campaign and line item data without blocking the event loop.
+    """
+    return await asyncio.to_thread(_load_data_from_local_database)
+
+def _load_data_from_local_database():
     """
     Fetch campaign and line item data from the local database.
     """
+    from src.shared_utils.local_db import LocalDatabase
+
+    local_database = None
     try:
         local_database = LocalDatabase()
         campaigns = local_database.fetch_data('campaign', 
@@ -95,7 +210,6 @@ async def _fetch_data_from_local_database():
             
             # Combine campaign data with line_items data
             for line_item in line_items:
-                line_item['pacing_osi'] = float(line_item['pacing_osi'])
                 combined_data = {
                     'campaign_id': campaign['id'],
                     'campaign_name': campaign.get('name', ''),  # Example: include campaign name if available
@@ -103,32 +217,80 @@ async def _fetch_data_from_local_database():
                 }
                 data.append(combined_data)
         
-        return data
+        # Validate the facts once at load instead of per rule and per post
+        return load_facts(data)
     except Exception as e:
         logger.error(f"Error fetching data from local database: {e}")
         raise
+    finally:
+        if local_database is not None:
+            local_database.close()
 
 async def _fetch_rules_from_local_database():
+    """
+    Fetch rule definitions without blocking the event loop.
+    """
+    return await asyncio.to_thread(_load_rules_from_local_database)
+
+def _load_rules_from_local_database():
     """
     Fetch rule definitions from the local database.
     """
+    from src.shared_utils.local_db import LocalDatabase
+
+    local_database = None
     try:
         local_database = LocalDatabase()
         rules = local_database.fetch_data('rule_definitions', ['id', 'type', 'rule'])
-        return rules
+        return _validate_rules(rules)
     except Exception as e:
         logger.error(f"Error fetching rules from local database: {e}")
         raise
+    finally:
+        if local_database is not None:
+            local_database.close()
 
-async def _run_rules_engine_async(data, rules):
+def _validate_rules(rules):
+    """
+    Validate the rule definitions once at load, skipping malformed rules.
+
+    Aggregates are shared by name across rules, so a rule redefining an aggregate
+    differently from an earlier rule is skipped as well.
+    """
+    valid_rules = []
+    aggregates = {}
+    for rule in rules:
+        try:
+            definition = RuleDefinition.model_validate(rule['rule']).to_rule()
+        except ValidationError as e:
+            logger.error(f"Skipping invalid rule definition {rule['id']}: {e}")
+            continue
+
+        declared = dict(aggregates)
+        conflicts = [
+            aggregate['name'] for aggregate in definition.get('aggregates', [])
+            if declared.setdefault(aggregate['name'], aggregate) != aggregate
+        ]
+        if conflicts:
+            logger.error(f"Skipping rule definition {rule['id']}: conflicting definitions for aggregates {conflicts}")
+            continue
+
+        aggregates = declared
+        rule['rule'] = definition
+        valid_rules.append(rule)
+    return valid_rules
+
+async def _run_rules_engine_async(data, rules, run_performance_metrics):
     """
     Asynchronous wrapper for running the rules engine.
     """
+    from ..utils.rules_runner import RulesRunner
+
     try:
-        start_time = rules_performance_metrics.start_timer()
+        start_time = run_performance_metrics.start_timer()
         rules_runner = RulesRunner()
         await rules_runner.run(data, rules)
-        rules_performance_metrics.stop_timer(start_time, "rules_eval_time")
+        run_performance_metrics.stop_timer(start_time, "rules_eval_time")
     except Exception as e:
         logger.error(f"Error running rules engine: {e}")
         raise
\ No newline at end of file
@@ -0,0 +1,191 @@
+"""Action dispatcher module"""
+
+# Standard library imports
+import asyncio
+import json
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+# Third-party library imports
+from src.shared_utils.utils import get_logger
+from src.shared_utils.config import get_config
+
+# Configure logging
+logger = get_logger("action-dispatcher")
+
+
+class LoggingActionSink:
+    """Stub sink that logs one line per delivered digest instead of calling a downstream system."""
+
+    def __init__(self):
+        """Initialize the LoggingActionSink."""
+        self.deliveries = []
+
+    async def deliver(self, action: Dict[str, Any], facts: List[Dict[str, Any]]) -> None:
+        """
+        Deliver a coalesced digest.
+
+        Args:
+            action: The action configuration shared by the digest.
+            facts: References to the facts that fired the action.
+        """
+        self.deliveries.append((action, facts))
+        if action['type'] == 'notify':
+            logger.info(f"Notification sent to {action['recipient']}: {action['template']} ({len(facts)} facts)")
+        elif action['type'] == 'alert':
+            logger.info(f"Alert: {action['message']} ({len(facts)} facts)")
+        elif action['type'] == 'redistribute':
+            logger.info(f"Redistributing impressions: {action['params']} ({len(facts)} facts)")
+
+
+class ActionBatch:
+    """Class responsible for coalescing the actions fired during a run into digests."""
+
+    def __init__(self):
+        """Initialize the ActionBatch."""
+        self.digests: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+
+    def submit(self, action: Dict[str, Any], fact: Dict[str, Any]) -> None:
+        """
+        Coalesce an action into its digest without blocking.
+
+        Args:
+            action: Action configuration.
+            fact: Reference to the fact that fired the action.
+        """
+        digest = self.digests.setdefault(self._coalesce_key(action), {'action': action, 'facts': []})
+        digest['facts'].append(fact)
+
+    def _coalesce_key(self, action: Dict[str, Any]) -> Tuple[Any, ...]:
+        """
+        Build the key under which actions are coalesced into a single digest.
+
+        Args:
+            action: Action configuration.
+
+        Returns:
+            The coalescing key.
+        """
+        if action['type'] == 'notify':
+            return ('notify', action['recipient'], action['template'])
+        elif action['type'] == 'alert':
+            return ('alert', action['message'])
+        return (action['type'], json.dumps(action.get('params'), sort_keys=True, default=str))
+
+
+class ActionDispatcher:
+    """Class responsible for delivering action digests in the background."""
+
+    def __init__(self, sink=None, max_queue_size: int = 10000, max_deliveries_per_second: float = 10.0,
+                 max_retries: int = 3, retry_backoff: float = 0.5, drain_timeout: float = 10.0):
+        """
+        Initialize the ActionDispatcher.
+
+        Args:
+            sink: Object exposing an async deliver(action, facts) method.
+            max_queue_size: Maximum number of digests awaiting delivery before new ones are dropped.
+            max_deliveries_per_second: Rate limit applied to sink deliveries.
+            max_retries: Number of retries for a failed delivery.
+            retry_backoff: Base delay in seconds for the exponential retry backoff.
+            drain_timeout: Maximum number of seconds drain() waits for the queued digests.
+        """
+        self.sink = sink if sink is not None else LoggingActionSink()
+        self.max_queue_size = max_queue_size
+        self.min_delivery_interval = 1.0 / max_deliveries_per_second if max_deliveries_per_second else 0.0
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.drain_timeout = drain_timeout
+        self.queue: Optional[asyncio.Queue] = None
+        self.worker: Optional[asyncio.Task] = None
+        self.last_delivery = 0.0
+        self.delivering = False
+
+    def dispatch(self, batch: ActionBatch) -> None:
+        """
+        Queue the digests of a batch for delivery without waiting for them.
+
+        Args:
+            batch: The batch of a finished run.
+        """
+        if not batch.digests:
+            return
+
+        # The worker lives on the event loop of the first run, restart it if that loop is gone
+        if self.worker is None or self.worker.done() or self.worker.get_loop() is not asyncio.get_running_loop():
+            self.queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self.worker = asyncio.create_task(self._consume())
+
+        dropped = 0
+        for digest in batch.digests.values():
+            try:
+                self.queue.put_nowait(digest)
+            except asyncio.QueueFull:
+                dropped += len(digest['facts'])
+        batch.digests = {}
+
+        if dropped:
+            logger.warning(f"Dropped {dropped} actions because the delivery queue was full.")
+
+    async def drain(self) -> None:
+        """
+        Wait at most drain_timeout seconds for the queued digests to be delivered and
+        stop the background worker. Digests still undelivered by then are abandoned.
+        """
+        if self.worker is None:
+            return
+
+        try:
+            await asyncio.wait_for(self.queue.join(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            abandoned = self.queue.qsize() + (1 if self.delivering else 0)
+            logger.warning(f"Abandoned {abandoned} action digests still undelivered after {self.drain_timeout}s.")
+        self.worker.cancel()
+        self.worker = None
+        self.queue = None
+
+    async def _consume(self) -> None:
+        """Deliver queued digests one at a time."""
+        while True:
+            digest = await self.queue.get()
+            self.delivering = True
+            try:
+                await self._deliver_with_retry(digest['action'], digest['facts'])
+            finally:
+                self.delivering = False
+                self.queue.task_done()
+
+    async def _deliver_with_retry(self, action: Dict[str, Any], facts: List[Dict[str, Any]]) -> None:
+        """
+        Deliver a digest honouring the rate limit, retrying with exponential backoff.
+
+        Args:
+            action: The action configuration shared by the digest.
+            facts: References to the facts that fired the action.
+        """
+        for attempt in range(self.max_retries + 1):
+            wait = self.last_delivery + self.min_delivery_interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self.last_delivery = time.monotonic()
+
+            try:
+                await self.sink.deliver(action, facts)
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.error(f"Error delivering {action['type']} action after {attempt + 1} attempts: {e}")
+                    return
+                delay = self.retry_backoff * (2 ** attempt)
+                logger.warning(f"Error delivering {action['type']} action, retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+
+
+# Process-wide dispatcher, so delivering the actions of a run does not delay its response
+actions_config = get_config("actions")
+action_dispatcher = ActionDispatcher(
+    max_queue_size=actions_config.get("max_queue_size", 10000),
+    max_deliveries_per_second=actions_config.get("max_deliveries_per_second", 10.0),
+    max_retries=actions_config.get("max_retries", 3),
+    retry_backoff=actions_config.get("retry_backoff_seconds", 0.5),
+    drain_timeout=actions_config.get("drain_timeout_seconds", 10.0),
+)
@@ -0,0 +1,165 @@
+"""Rules aggregator module"""
+
+# Standard library imports
+from typing import List, Dict, Any, Set
+
+# Third-party library imports
+from src.shared_utils.utils import get_logger
+
+# Configure logging
+logger = get_logger("rules-aggregator")
+
+# Key under which the aggregate results are attached to each fact
+AGGREGATES_KEY = "aggregates"
+
+
+class RulesAggregator:
+    """Class responsible for precomputing grouped aggregates over the fact set."""
+
+    def __init__(self):
+        """Initialize the RulesAggregator."""
+        pass
+
+    def collect_aggregates(self, rules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Collect the aggregate definitions declared by the rules. They were validated at
+        load by the RuleDefinition model.
+
+        Each rule may declare an 'aggregates' list, e.g.:
+            {"name": "campaign_impressions", "function": "sum",
+             "field": "impressions_delivered", "group_by": "campaign_id"}
+        Conditions then reference the result as 'aggregates.campaign_impressions'.
+
+        Args:
+            rules: List of rules as fetched from rule_definitions.
+
+        Returns:
+            De-duplicated list of aggregate definitions. Rules redefining an aggregate
+            differently are skipped at load; should one get here, the first definition wins.
+        """
+        aggregates = {}
+        for rule in rules:
+            for aggregate in rule['rule'].get('aggregates', []):
+                existing = aggregates.setdefault(aggregate['name'], aggregate)
+                if existing != aggregate:
+                    logger.error(f"Ignoring conflicting definition for aggregate: {aggregate['name']}")
+        return list(aggregates.values())
+
+    def attach_aggregates(self, data: List[Dict[str, Any]], aggregates: List[Dict[str, Any]]) -> None:
+        """
+        Compute the aggregates in a single pass over the data and attach the
+        group results to each fact under the 'aggregates' key.
+
+        Args:
+            data: List of records to evaluate.
+            aggregates: Aggregate definitions returned by collect_aggregates.
+        """
+        if not aggregates:
+            return
+
+        # One accumulator per (aggregate, group key): [sum, count, min, max]
+        accumulators = {aggregate['name']: {} for aggregate in aggregates}
+        for record in data:
+            for aggregate in aggregates:
+                self._accumulate(accumulators[aggregate['name']], aggregate, record)
+
+        results = {
+            aggregate['name']: {
+                group: self._finalize(aggregate['function'], accumulator)
+                for group, accumulator in accumulators[aggregate['name']].items()
+            }
+            for aggregate in aggregates
+        }
+
+        # Update rather than replace, so that refreshing some aggregates keeps the others
+        for record in data:
+            record.setdefault(AGGREGATES_KEY, {}).update({
+                aggregate['name']: results[aggregate['name']].get(record.get(aggregate['group_by']))
+                for aggregate in aggregates
+            })
+
+        logger.info(f"Attached {len(aggregates)} aggregates to {len(data)} facts.")
+
+    def get_affected_aggregates(self, aggregates: List[Dict[str, Any]], fields: Set[str]) -> List[Dict[str, Any]]:
+        """
+        Get the aggregates computed from any of the given fields.
+
+        Args:
+            aggregates: Aggregate definitions returned by collect_aggregates.
+            fields: Names of the top-level fields that changed.
+
+        Returns:
+            The aggregates that must be recomputed.
+        """
+        return [
+            aggregate for aggregate in aggregates
+            if (aggregate.get('field') or '').split('.')[0] in fields or aggregate['group_by'] in fields
+        ]
+
+    def _accumulate(self, groups: Dict[Any, List[Any]], aggregate: Dict[str, Any], record: Dict[str, Any]) -> None:
+        """
+        Fold a single record into its group accumulator.
+
+        Args:
+            groups: Accumulators keyed by group value.
+            aggregate: Aggregate definition.
+            record: The record to fold in.
+        """
+        group = record.get(aggregate['group_by'])
+        if group is None:
+            return
+
+        accumulator = groups.setdefault(group, [0, 0, None, None])
+        if aggregate['function'] == 'count':
+            accumulator[1] += 1
+            return
+
+        value = self._get_field(record, aggregate['field'].split('.'))
+        if value is None:
+            return
+
+        accumulator[0] += value
+        accumulator[1] += 1
+        accumulator[2] = value if accumulator[2] is None else min(accumulator[2], value)
+        accumulator[3] = value if accumulator[3] is None else max(accumulator[3], value)
+
+    def _get_field(self, record: Dict[str, Any], keys: List[str]) -> Any:
+        """
+        Get the value at a nested field path.
+
+        Args:
+            record: The record to read.
+            keys: List of keys representing the nested field path.
+
+        Returns:
+            The value, or None when the path is missing.
+        """
+        value = record
+        for key in keys:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value
+
+    def _finalize(self, function: str, accumulator: List[Any]) -> Any:
+        """
+        Turn a group accumulator into the aggregate value. Every function but
+        count gives None for a group without any non-null value.
+
+        Args:
+            function: Aggregate function name.
+            accumulator: The [sum, count, min, max] accumulator.
+
+        Returns:
+            The aggregate value.
+        """
+        total, count, minimum, maximum = accumulator
+        if function == 'sum':
+            return total if count else None
+        elif function == 'avg':
+            return total / count if count else None
+        elif function == 'min':
+            return minimum
+        elif function == 'max':
+            return maximum
+        return count
@@ -2,7 +2,6 @@
 
 # Standard library imports
 import time
-import psutil
 import os
 
 class RulesPerformanceMetrics:
@@ -45,6 +44,8 @@ class RulesPerformanceMetrics:
         """
         Record CPU and memory usage of the current process.
         """
+        import psutil  # Imported lazily to keep worker start-up light
+
         process_info = psutil.Process()
         self.metrics["cpu_usage"] = process_info.cpu_percent(interval=1)
         self.metrics["memory_usage"] = process_info.memory_info().rss / (1024 * 1024)  # in MB
@@ -55,6 +56,8 @@ class RulesPerformanceMetrics:
         """
         Record system-level metrics such as CPU count, memory, and disk usage.
         """
+        import psutil  # Imported lazily to keep worker start-up light
+
         self.metrics["system_cpu_count"] = psutil.cpu_count(logical=True)
         self.metrics["system_memory_total"] = psutil.virtual_memory().total / (1024 * 1024)  # in MB
         self.metrics["system_memory_available"] = psutil.virtual_memory().available / (1024 * 1024)  # in MB
@@ -1,9 +1,15 @@
 # Standard library imports
-import json
 import asyncio
+import hashlib
+import json
+from contextvars import ContextVar
 
 # Third-party library imports
 from src.shared_utils.utils import get_logger
+from src.shared_utils.tracer import tracer
+from .action_dispatcher import ActionBatch, action_dispatcher
+from .rules_aggregator import RulesAggregator
+from .rules_scheduler import RulesScheduler
 from durable.lang import ruleset, when_all, when_any, m, post
 from functools import reduce
 from typing import List, Dict, Any
@@ -11,12 +17,22 @@ from typing import List, Dict, Any
 # Configure logging
 logger = get_logger("rules-runner")
 
+# Durable rulesets are registered once per process, so their handlers look up the runner
+# of the current run instead of binding the runner that first defined them
+_current_runner: ContextVar["RulesRunner"] = ContextVar("current_runner")
+
+# Names of the rulesets already registered with durable in this process
+_defined_rulesets = set()
+
 class RulesRunner:
     """Class responsible for evaluating rules on campaigns stored in a local database."""
 
     def __init__(self):
         """Initialize the RulesRunner."""
-        pass
+        self.rules_aggregator = RulesAggregator()
+        self.rules_scheduler = RulesScheduler()
+        self.action_batch = ActionBatch()
+        self.facts_by_id = {}
 
     async def run(self, data: List[Dict[str, Any]], rules: List[Dict[str, Any]]):
         """
@@ -26,7 +42,30 @@ class RulesRunner:
             data: List of records to evaluate.
             rules: List of rules to apply.
         """
-        await asyncio.gather(*[asyncio.create_task(self._process_rule_async(rule, data)) for rule in rules])
+        # Precompute grouped aggregates so aggregate conditions stay O(N)
+        aggregates = self.rules_aggregator.collect_aggregates(rules)
+        self.rules_aggregator.attach_aggregates(data, aggregates)
+
+        # Order rules so that a rule reading a field (or an aggregate of it) runs after the rules updating it
+        stages = self.rules_scheduler.build_stages(rules, aggregates)
+        self.facts_by_id = {record['id']: record for record in data if 'id' in record}
+
+        # Actions are coalesced into digests during evaluation and delivered in the background afterwards
+        try:
+            for index, stage in enumerate(stages):
+                logger.info(f"Evaluating stage {index + 1}/{len(stages)} with {len(stage)} rules.")
+                with tracer.span("RulesRunner.stage", stage=index + 1, rules=len(stage)):
+                    await asyncio.gather(*[asyncio.create_task(self._process_rule_async(rule, data)) for rule in stage])
+
+                # Recompute the aggregates of fields this stage may have updated before the next stages read them
+                if index + 1 < len(stages):
+                    stale = self.rules_aggregator.get_affected_aggregates(
+                        aggregates, self.rules_scheduler.get_written_fields(stage))
+                    if stale:
+                        with tracer.span("RulesAggregator.refresh", aggregates=len(stale)):
+                            self.rules_aggregator.attach_aggregates(data, stale)
+        finally:
+            action_dispatcher.dispatch(self.action_batch)
 
     async def _process_rule_async(self, rule: Dict[str, Any], data: List[Dict[str, Any]]):
         """
@@ -37,6 +76,9 @@ class RulesRunner:
             data: The data to evaluate the rule against.
         """
         rule_data = rule['rule']
+
+        # Each rule runs in its own task, so this only binds the handlers to the current run
+        _current_runner.set(self)
         
         logger.info("Ruleset defined and facts fetched.")
         await self._define_rule(rule_data)
@@ -44,6 +86,7 @@ class RulesRunner:
         logger.info(f"Starting rules evaluation for rule: {rule_data['name']}")
         await self._evaluate_rule_async(rule_data, data)
 
+    @tracer.trace()
     async def _define_rule(self, rule: Dict[str, Any]):
         """
         Define a rule and process facts.
@@ -51,10 +94,15 @@ class RulesRunner:
         Args:
             rule: The rule to define.
         """
-        ruleset_name = rule['name']
+        ruleset_name = self._get_ruleset_name(rule)
         condition = rule['condition']
         actions = rule['actions']
 
+        # Durable cannot register a ruleset name twice: reuse the ruleset of an identical rule
+        if ruleset_name in _defined_rulesets:
+            logger.info(f"Rule ({ruleset_name}) already defined.")
+            return
+
         logger.info(f"Defining Rule ({ruleset_name}, {condition}) => {actions}")
 
         with ruleset(ruleset_name):
@@ -65,20 +113,24 @@ class RulesRunner:
                 @when_all(self._build_dynamic_condition(condition['all']))
                 def rule_handler_all(c):
                     logger.info(f"Executing rule: {ruleset_name}")
-                    self._execute_actions(c, actions)
+                    _current_runner.get()._execute_actions(c, actions)
 
             # Handle 'any' conditions
             elif 'any' in condition:
                 @when_any(self._build_dynamic_condition(condition['any'], is_all=False))
                 def rule_handler_any(c):
                     logger.info(f"Executing rule: {ruleset_name}")
-                    self._execute_actions(c, actions)
+                    _current_runner.get()._execute_actions(c, actions)
 
             # Default rule: Handle any message that doesn't match other rules
             @when_all(+m.campaign_id)
             def default_handler(c):
                 logger.info(f"Default rule matched: Campaign {c.m.campaign_id} does not match any specific rules.")
 
+        # Only mark the ruleset as defined once durable accepted its definition
+        _defined_rulesets.add(ruleset_name)
+
+    @tracer.trace()
     async def _evaluate_rule_async(self, rule: Dict[str, Any], data: List[Dict[str, Any]]):
         """
         Evaluate rules for each record and post the result.
@@ -87,13 +139,26 @@ class RulesRunner:
             rule: The rule to evaluate.
             data: The data to evaluate the rule against.
         """
-        ruleset_name = rule['name']
+        ruleset_name = self._get_ruleset_name(rule)
         for record in data:
             logger.info(f"Evaluating Rule ({ruleset_name}) => {record}")
 
             # Post the record for evaluation
             await self._execute_post_async(ruleset_name, record)
 
+    def _get_ruleset_name(self, rule: Dict[str, Any]) -> str:
+        """
+        Get the durable ruleset name of a rule, unique per rule definition.
+
+        Args:
+            rule: The rule definition.
+
+        Returns:
+            The rule name suffixed with a hash of its definition.
+        """
+        digest = hashlib.sha1(json.dumps(rule, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        return f"{rule['name']}_{digest[:12]}"
+
     def _build_dynamic_condition(self, conditions: List[Dict[str, Any]], is_all: bool = True) -> Any:
         """
         Build dynamic condition expressions.
@@ -139,6 +204,7 @@ class RulesRunner:
         else:
             raise ValueError(f"Unsupported operator: {operator}")
 
+    @tracer.trace()
     def _execute_actions(self, c, actions: List[Dict[str, Any]]) -> None:
         """
         Execute actions based on the rule.
@@ -151,15 +217,23 @@ class RulesRunner:
             try:
                 if action['type'] == 'update':
                     self._perform_update(c, action)
-                elif action['type'] == 'redistribute':
-                    logger.info(f"Redistributing impressions: {action['params']}")
-                elif action['type'] == 'alert':
-                    logger.info(f"Alert: {action['message']}")
-                elif action['type'] == 'notify':
-                    logger.info(f"Notification sent to {action['recipient']}: {action['template']}", c.m.campaign.id)
+                elif action['type'] in ('redistribute', 'alert', 'notify'):
+                    self.action_batch.submit(action, self._get_fact_reference(c))
             except Exception as e:
                 logger.error(f"Error executing action {action['type']}: {e}")
 
+    def _get_fact_reference(self, c) -> Dict[str, Any]:
+        """
+        Get the identifying fields of the fact that fired an action.
+
+        Args:
+            c: Context object.
+
+        Returns:
+            Dictionary with the fact and campaign identifiers.
+        """
+        return {key: c.m[key] for key in ('id', 'campaign_id') if key in c.m}
+
     def _perform_update(self, c, action: Dict[str, Any]) -> None:
         """
         Perform update action.
@@ -183,20 +257,36 @@ class RulesRunner:
                 raise
 
             keys = action['target_field'].split('.')
-            target = c.m
+            self._set_field(c.m, keys, expression_result)
 
-            # Navigate through the target field path in the context
-            for key in keys[:-1]:
-                if key not in target:
-                    target[key] = {}
-                target = target[key]
+            # Write the update back to the shared fact so downstream stages see it
+            fact_id = c.m['id'] if 'id' in c.m else None
+            if fact_id in self.facts_by_id:
+                self._set_field(self.facts_by_id[fact_id], keys, expression_result)
 
-            # Update the final key with the evaluated result
-            target[keys[-1]] = expression_result
             logger.info(f"Updated {action['target_field']} to {expression_result}")
         except Exception as e:
             logger.error(f"Error updating field {action['target_field']}: {e}")
 
+    def _set_field(self, target, keys: List[str], value: Any) -> None:
+        """
+        Set a value at a nested field path, creating intermediate objects as needed.
+
+        Args:
+            target: The fact to update.
+            keys: Path to the field in the fact.
+            value: Value to set.
+        """
+        # Navigate through the target field path
+        for key in keys[:-1]:
+            if key not in target:
+                target[key] = {}
+            target = target[key]
+
+        # Update the final key with the value
+        target[keys[-1]] = value
+
+    @tracer.trace()
     async def _execute_post_async(self, ruleset_name: str, record: Dict[str, Any]):
         """
         Post the record for evaluation.
@@ -206,9 +296,7 @@ class RulesRunner:
             record: The record to post.
         """
         try:
-            # Validate JSON serializability
-            json.dumps(record)
-
+            # Facts are validated once at load (see model.fact), so no per-post serializability check
             post(ruleset_name, record)
         except Exception as e:
             logger.error(f"Error posting record to ruleset {ruleset_name}: {e}")
\ No newline at end of file
@@ -0,0 +1,221 @@
+"""Rules scheduler module"""
+
+# Standard library imports
+import ast
+from typing import List, Dict, Any, Set, Tuple
+
+# Third-party library imports
+from src.shared_utils.utils import get_logger
+from .rules_aggregator import AGGREGATES_KEY
+
+# Configure logging
+logger = get_logger("rules-scheduler")
+
+# Dependency cycles already reported, as sets of rule names, so each is logged once per process
+_reported_cycles = set()
+
+
+class RulesScheduler:
+    """Class responsible for ordering rules into dependency stages."""
+
+    def __init__(self):
+        """Initialize the RulesScheduler."""
+        pass
+
+    def build_stages(self, rules: List[Dict[str, Any]],
+                     aggregates: List[Dict[str, Any]] = ()) -> List[List[Dict[str, Any]]]:
+        """
+        Derive the dependency graph between rules and split it into topological stages.
+
+        A rule depends on another rule when one of the field paths it reads (condition
+        fields and update expressions) overlaps a 'target_field' the other rule writes.
+        Reading 'aggregates.<name>' counts as reading the aggregate's field and group_by.
+        Rules within a stage are independent and can be evaluated in parallel. Cycles are
+        logged once per process and broken by running the rules involved one stage at a time.
+
+        Args:
+            rules: List of rules as fetched from rule_definitions.
+            aggregates: Aggregate definitions returned by RulesAggregator.collect_aggregates.
+
+        Returns:
+            List of stages, each stage being a list of rules sorted by priority.
+        """
+        aggregates_by_name = {aggregate['name']: aggregate for aggregate in aggregates}
+        reads = [self._get_read_paths(rule['rule'], aggregates_by_name) for rule in rules]
+        writes = [self._get_write_paths(rule['rule']) for rule in rules]
+
+        # dependents[i] holds the rules that must run after rule i
+        dependents = {i: set() for i in range(len(rules))}
+        in_degree = {i: 0 for i in range(len(rules))}
+        for writer in range(len(rules)):
+            for reader in range(len(rules)):
+                # A rule reading its own output is not a scheduling dependency
+                if writer == reader:
+                    continue
+                if self._paths_overlap(writes[writer], reads[reader]):
+                    dependents[writer].add(reader)
+                    in_degree[reader] += 1
+
+        cycles = self._find_cycles(dependents)
+        cyclic = {i for cycle in cycles for i in cycle}
+        for cycle in cycles:
+            names = frozenset(rules[i]['rule']['name'] for i in cycle)
+            if names not in _reported_cycles:
+                _reported_cycles.add(names)
+                logger.warning(f"Dependency cycle detected among rules: {sorted(names)}")
+
+        stages = []
+        pending = set(range(len(rules)))
+        ready = [i for i in pending if in_degree[i] == 0]
+        while pending:
+            if not ready:
+                # Every pending rule waits on another one: break a cycle by running its least
+                # constrained rule (then the lowest priority, then load order) on its own
+                ready = [min(pending & cyclic, key=lambda i: (in_degree[i], rules[i]['rule'].get('priority', 0), i))]
+
+            stages.append(sorted((rules[i] for i in ready), key=lambda r: r['rule'].get('priority', 0)))
+            pending.difference_update(ready)
+            next_ready = []
+            for i in ready:
+                for dependent in dependents[i]:
+                    if dependent not in pending:
+                        continue
+                    in_degree[dependent] -= 1
+                    if in_degree[dependent] == 0:
+                        next_ready.append(dependent)
+            ready = next_ready
+
+        logger.info(f"Scheduled {len(rules)} rules into {len(stages)} stages.")
+        return stages
+
+    def _find_cycles(self, dependents: Dict[int, Set[int]]) -> List[List[int]]:
+        """
+        Find the dependency cycles, i.e. the strongly connected components with more than
+        one rule (Tarjan's algorithm, iterative).
+
+        Args:
+            dependents: Rules that must run after each rule, by rule index.
+
+        Returns:
+            List of cycles, each cycle being a list of rule indexes.
+        """
+        index_of, low_link = {}, {}
+        stack, on_stack = [], set()
+        cycles = []
+        for root in dependents:
+            if root in index_of:
+                continue
+            work = [(root, iter(dependents[root]))]
+            index_of[root] = low_link[root] = len(index_of)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, children = work[-1]
+                child = next(children, None)
+                if child is not None:
+                    if child not in index_of:
+                        index_of[child] = low_link[child] = len(index_of)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(dependents[child])))
+                    elif child in on_stack:
+                        low_link[node] = min(low_link[node], index_of[child])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low_link[parent] = min(low_link[parent], low_link[node])
+                if low_link[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1:
+                        cycles.append(sorted(component))
+        return cycles
+
+    def get_written_fields(self, rules: List[Dict[str, Any]]) -> Set[str]:
+        """
+        Get the top-level fields written by the update actions of the rules.
+
+        Args:
+            rules: List of rules as fetched from rule_definitions.
+
+        Returns:
+            Set of field names.
+        """
+        return {path[0] for rule in rules for path in self._get_write_paths(rule['rule'])}
+
+    def _get_read_paths(self, rule: Dict[str, Any],
+                        aggregates_by_name: Dict[str, Dict[str, Any]]) -> Set[Tuple[str, ...]]:
+        """
+        Get the field paths read by a rule.
+
+        Args:
+            rule: The rule definition.
+            aggregates_by_name: Aggregate definitions keyed by name.
+
+        Returns:
+            Set of field paths as tuples of keys.
+        """
+        paths = set()
+        for conditions in rule['condition'].values():
+            for cond in conditions:
+                paths.add(tuple(cond['field'].split('.')))
+
+        for action in rule['actions']:
+            if action['type'] == 'update':
+                for node in ast.walk(ast.parse(action['expression'], mode='eval')):
+                    if isinstance(node, ast.Name):
+                        paths.add((node.id,))
+
+        # An aggregate changes with the fields it is computed from
+        for path in list(paths):
+            if path[0] != AGGREGATES_KEY:
+                continue
+            names = [path[1]] if len(path) > 1 else list(aggregates_by_name)
+            for name in names:
+                aggregate = aggregates_by_name.get(name)
+                if aggregate is None:
+                    continue
+                paths.add((aggregate['group_by'],))
+                if aggregate.get('field') is not None:
+                    paths.add(tuple(aggregate['field'].split('.')))
+        return paths
+
+    def _get_write_paths(self, rule: Dict[str, Any]) -> Set[Tuple[str, ...]]:
+        """
+        Get the field paths written by a rule.
+
+        Args:
+            rule: The rule definition.
+
+        Returns:
+            Set of field paths as tuples of keys.
+        """
+        return {
+            tuple(action['target_field'].split('.'))
+            for action in rule['actions'] if action['type'] == 'update'
+        }
+
+    def _paths_overlap(self, writes: Set[Tuple[str, ...]], reads: Set[Tuple[str, ...]]) -> bool:
+        """
+        Check whether any written path is a prefix of a read path or vice versa.
+
+        Args:
+            writes: Field paths written.
+            reads: Field paths read.
+
+        Returns:
+            True if the paths overlap.
+        """
+        for write in writes:
+            for read in reads:
+                length = min(len(write), len(read))
+                if write[:length] == read[:length]:
+                    return True
+        return False
@@ -0,0 +1,108 @@
+"""Admission control module"""
+
+# Standard library imports
+import asyncio
+from contextlib import asynccontextmanager
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted because the service is overloaded."""
+
+
+class AdmissionController:
+    """
+    Bounds the number of concurrent executions of an expensive operation.
+
+    Up to `max_concurrent` executions run at once. Up to `max_queued` further requests
+    wait for a free slot, for at most `queue_timeout` seconds. Requests beyond that are
+    rejected right away, so overload degrades into fast rejections instead of exhausting
+    the database.
+    """
+
+    def __init__(self, max_concurrent=4, max_queued=16, queue_timeout=30.0):
+        """
+        Initialize the admission controller.
+
+        :param max_concurrent: Maximum number of concurrent executions.
+        :param max_queued: Maximum number of requests waiting for a slot.
+        :param queue_timeout: Maximum seconds a request waits for a slot.
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.running = 0
+        self.queued = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    @asynccontextmanager
+    async def admit(self):
+        """
+        Hold an execution slot for the duration of the managed block.
+
+        :raises AdmissionRejected: If the queue is full or the wait times out.
+        """
+        if self._semaphore.locked() and self.queued >= self.max_queued:
+            self.rejected += 1
+            raise AdmissionRejected(f"Too many requests: {self.running} running, {self.queued} queued.")
+
+        if not self._semaphore.locked():
+            # A slot is free: acquire() returns without suspending
+            await self._semaphore.acquire()
+        else:
+            await self._wait_for_slot()
+
+        self.running += 1
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self._semaphore.release()
+
+    async def _wait_for_slot(self):
+        """
+        Wait in the queue for an execution slot.
+
+        :raises AdmissionRejected: If the wait times out.
+        """
+        self.queued += 1
+        # Acquire in a task, so a permit obtained as the wait times out is not lost with it
+        acquire = asyncio.ensure_future(self._semaphore.acquire())
+        try:
+            await asyncio.wait_for(asyncio.shield(acquire), timeout=self.queue_timeout)
+        except asyncio.TimeoutError as e:
+            self._abandon(acquire)
+            self.rejected += 1
+            raise AdmissionRejected(f"Timed out after {self.queue_timeout}s waiting for an execution slot.") from e
+        except asyncio.CancelledError:
+            self._abandon(acquire)
+            raise
+        finally:
+            self.queued -= 1
+
+    def _abandon(self, acquire):
+        """
+        Cancel a pending acquire, releasing the permit if it was acquired in the meantime.
+
+        :param acquire: The task acquiring the semaphore.
+        """
+        def release_if_acquired(task):
+            if not task.cancelled() and task.exception() is None:
+                self._semaphore.release()
+
+        acquire.add_done_callback(release_if_acquired)
+        acquire.cancel()
+
+    def get_status(self):
+        """
+        Get the current admission state.
+
+        :return: A dictionary with the limits and current counts.
+        """
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+            "running": self.running,
+            "queued": self.queued,
+            "rejected": self.rejected,
+        }
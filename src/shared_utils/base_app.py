@@ -4,11 +4,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-def create_app(title):
+def create_app(title, lifespan=None):
     """
     Creates and configures the Fast application.
 
     :param title: The title of the application.
+    :param lifespan: Optional lifespan context manager running the startup and shutdown hooks.
     :return: The configured Fast application instance.
     """
     # Create the application instance
@@ -16,7 +17,8 @@ def create_app(title):
                   description="This is a very cool API.",
                   version="1.0",
                   openapi_url="/api/openapi.json",
-                  root_path="/api/v1")
+                  root_path="/api/v1",
+                  lifespan=lifespan)
 
     # Add CORS middleware
     app.add_middleware(
@@ -3,6 +3,7 @@
 # Standard library imports
 import json
 import os
+from functools import lru_cache
 
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "rules_config.db")
 
@@ -16,13 +17,22 @@ def get_config(section):
     Returns:
         dict: The configuration section, or an empty dictionary if the section is not found.
     """
+    return _load_config().get(section, {})
+
+@lru_cache(maxsize=1)
+def _load_config():
+    """
+    Reads and parses the configuration file once per process.
+
+    Returns:
+        dict: The full configuration.
+    """
     if not os.path.exists(CONFIG_PATH):
         raise FileNotFoundError(f"Configuration file '{CONFIG_PATH}' not found.")
 
     try:
         with open(CONFIG_PATH, "r", encoding="utf-8") as config_file:
-            config = json.load(config_file)
-            return config.get(section, {})
+            return json.load(config_file)
     except json.JSONDecodeError as e:
         raise ValueError(f"Error decoding JSON from the configuration file '{CONFIG_PATH}'.") from e
     except Exception as e:
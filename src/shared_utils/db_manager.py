@@ -2,7 +2,41 @@
 
 # Third-party library imports
 from .config import get_config
+from .tracer import tracer
 from psycopg2 import connect, OperationalError, sql
+from psycopg2.pool import ThreadedConnectionPool
+
+# Process-wide connection pool, opened by the app's startup hook
+_connection_pool = None
+
+def open_connection_pool(minconn=1, maxconn=10):
+    """
+    Open the process-wide connection pool using configuration values.
+
+    :param minconn: Number of connections opened up front.
+    :param maxconn: Maximum number of connections kept by the pool.
+    """
+    global _connection_pool
+    if _connection_pool is None:
+        config = get_config("database")
+        _connection_pool = ThreadedConnectionPool(
+            minconn,
+            maxconn,
+            dbname=config["dbname"],
+            user=config["user"],
+            password=config["password"],
+            host=config["host"],
+            port=config["port"]
+        )
+
+def close_connection_pool():
+    """
+    Close all connections of the process-wide connection pool.
+    """
+    global _connection_pool
+    if _connection_pool is not None:
+        _connection_pool.closeall()
+        _connection_pool = None
 
 class DatabaseManager:
     def __init__(self):
@@ -27,6 +61,12 @@ class DatabaseManager:
         if not all(key in self.config for key in required_keys):
             raise ValueError("Missing required database configuration keys.")
 
+        # Borrow a connection from the pool when the app opened one
+        self.pool = _connection_pool
+        if self.pool is not None:
+            self.conn = self.pool.getconn()
+            return
+
         try:
             self.conn = connect(
                 dbname=self.config["dbname"],
@@ -58,9 +98,9 @@ class DatabaseManager:
             placeholders=sql.SQL(", ").join(sql.Placeholder() * len(columns))
         )
         
-        with self.conn.cursor() as cur:
+        with tracer.span("DatabaseManager.insert", table=table), self.conn.cursor() as cur:
             cur.execute(query, values)
-        self.conn.commit()
+            self.conn.commit()
 
     def update(self, table, data, condition):
         """
@@ -87,9 +127,9 @@ class DatabaseManager:
             condition=sql.SQL(condition)
         )
         
-        with self.conn.cursor() as cur:
+        with tracer.span("DatabaseManager.update", table=table), self.conn.cursor() as cur:
             cur.execute(query, values)
-        self.conn.commit()
+            self.conn.commit()
 
     def delete(self, table, condition):
         """
@@ -106,9 +146,9 @@ class DatabaseManager:
             condition=sql.SQL(condition)
         )
         
-        with self.conn.cursor() as cur:
+        with tracer.span("DatabaseManager.delete", table=table), self.conn.cursor() as cur:
             cur.execute(query)
-        self.conn.commit()
+            self.conn.commit()
 
     def select(self, table, columns="*", condition=None):
         """
@@ -128,13 +168,16 @@ class DatabaseManager:
         if condition:
             query += sql.SQL(" WHERE {condition}").format(condition=sql.SQL(condition))
         
-        with self.conn.cursor() as cur:
+        with tracer.span("DatabaseManager.select", table=table), self.conn.cursor() as cur:
             cur.execute(query)
             rows = cur.fetchall()
         return rows
 
     def close(self):
         """
-        Close the database connection.
+        Close the database connection, or return it to the pool if it was borrowed.
         """
-        self.conn.close()
+        if self.pool is not None:
+            self.pool.putconn(self.conn)
+        else:
+            self.conn.close()
@@ -37,4 +37,8 @@ class LocalDatabase:
             elif fact['action'] == 'update':
                 self.update(table, fact['data']['id'], fact['data'])
             elif fact['action'] == 'delete':
-                self.delete(table, fact['data']['id'])
\ No newline at end of file
+                self.delete(table, fact['data']['id'])
+
+    def close(self):
+        """Release the database connection."""
+        self.db_manager.close()
\ No newline at end of file
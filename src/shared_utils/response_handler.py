@@ -58,3 +58,14 @@ class ResponseHandler:
         :return: A tuple containing the response dictionary and the status code.
         """
         return self.error(data=data, message=message, status_code=400)
+
+    def too_many_requests(self, data: Optional[Any] = None,
+                          message: str = "Too Many Requests") -> Dict[str, Any]:
+        """
+        Generate a too many requests response.
+
+        :param data: The data to include in the response.
+        :param message: The message to include in the response.
+        :return: A response dictionary.
+        """
+        return self.error(data=data, message=message, status_code=429)
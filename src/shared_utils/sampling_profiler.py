@@ -0,0 +1,157 @@
+"""Sampling profiler module"""
+
+# Standard library imports
+import sys
+import threading
+import time
+from collections import Counter
+
+# Sampling interval bounds, in seconds
+MIN_INTERVAL = 0.001
+DEFAULT_INTERVAL = 0.005
+
+# Hard cap on the number of samples kept for a single run
+DEFAULT_MAX_SAMPLES = 20000
+
+
+class SamplingProfiler:
+    """
+    Low-overhead statistical profiler sampling the stacks of every thread of the process.
+
+    A background thread wakes up every `interval` seconds, reads the current frame of
+    every other thread through sys._current_frames() and counts the collapsed stacks,
+    each rooted at a "thread <name>" frame. This covers the event loop thread as well as
+    the asyncio.to_thread workers running the database fetches and the system metrics.
+    The profiled threads are never instrumented, so their own code runs unchanged. The
+    cost is the sampler briefly holding the GIL to walk the stacks once per interval, and
+    at most `max_samples` times per run, so memory and CPU stay bounded on long runs.
+
+    Note that samples also include any other request served concurrently by the same
+    worker, and idle threads waiting for work.
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL, max_samples=DEFAULT_MAX_SAMPLES):
+        """
+        Initialize the sampling profiler.
+
+        :param interval: Seconds between two samples (at least 1 ms).
+        :param max_samples: Maximum number of samples taken, each one covering every thread.
+        """
+        self.interval = max(interval, MIN_INTERVAL)
+        self.max_samples = max_samples
+        self.stacks = Counter()
+        self.samples = 0
+        self.start_time = None
+        self.end_time = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Start sampling the threads of the process.
+        """
+        self._stop_event.clear()
+        self.start_time = time.monotonic()
+        self._thread = threading.Thread(target=self._sample_loop, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop sampling and wait for the sampler thread to finish.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.end_time = time.monotonic()
+
+    def collapsed(self):
+        """
+        Export the samples in collapsed-stack format ("frame;frame;frame count" per line),
+        as consumed by flamegraph.pl and speedscope.
+
+        :return: The collapsed stacks as a string.
+        """
+        return "\n".join(f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common())
+
+    def speedscope(self, name="rule-engine"):
+        """
+        Export the samples in speedscope's sampled profile format.
+
+        :param name: The profile name.
+        :return: A speedscope-compatible dictionary.
+        """
+        frames = []
+        frame_index = {}
+        samples = []
+        weights = []
+        for stack, count in self.stacks.items():
+            sample = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame})
+                sample.append(frame_index[frame])
+            samples.append(sample)
+            weights.append(count * self.interval)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+    def get_summary(self):
+        """
+        Get the sampling statistics of the run.
+
+        :return: A dictionary with the sampling parameters and counts.
+        """
+        end_time = self.end_time if self.end_time is not None else time.monotonic()
+        return {
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "max_samples": self.max_samples,
+            "duration_s": end_time - self.start_time if self.start_time is not None else 0,
+        }
+
+    def _sample_loop(self):
+        """
+        Take samples of every thread but the sampler until stopped or until the sample
+        cap is reached.
+        """
+        sampler_thread_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            if self.samples >= self.max_samples:
+                break
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():  # pylint: disable=protected-access
+                if thread_id != sampler_thread_id:
+                    thread_name = thread_names.get(thread_id, thread_id)
+                    self.stacks[self._collapse(frame, f"thread {thread_name}")] += 1
+            self.samples += 1
+
+    def _collapse(self, frame, root):
+        """
+        Turn a frame into a root-first tuple of "function (file:line)" entries.
+
+        :param frame: The innermost frame of the sampled thread.
+        :param root: The root frame naming the sampled thread.
+        :return: The collapsed stack.
+        """
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+            frame = frame.f_back
+        stack.append(root)
+        stack.reverse()
+        return tuple(stack)
@@ -0,0 +1,157 @@
+"""Tracer module"""
+
+# Standard library imports
+import asyncio
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+# Run being traced in the current context ({"events": [...], "tracks": {...}}), None when tracing is off
+_current_trace: ContextVar[Optional[Dict[str, Any]]] = ContextVar("current_trace", default=None)
+
+# Shared no-op context manager returned by span() when tracing is off
+_NULL_SPAN = nullcontext()
+
+
+class Tracer:
+    """
+    Lightweight tracer recording nested spans as Chrome trace-event JSON.
+
+    Spans are only recorded between start_run() and finish_run() in the same context,
+    so span() and trace() cost a single context variable lookup when no run is traced.
+    """
+
+    def __init__(self):
+        """
+        Initialize the tracer.
+        """
+        self.pid = os.getpid()
+
+    def start_run(self):
+        """
+        Start recording spans for the current context (and the tasks it spawns).
+
+        :return: Token to pass to finish_run.
+        """
+        return _current_trace.set({"events": [], "tracks": {}})
+
+    def finish_run(self, token, path=None):
+        """
+        Stop recording spans and optionally export them.
+
+        :param token: Token returned by start_run.
+        :param path: File path for the Chrome trace-event JSON, or None to skip exporting.
+        :return: The recorded trace events.
+        """
+        run = _current_trace.get()
+        events = run["events"] if run is not None else []
+        _current_trace.reset(token)
+        if path is not None:
+            self.export_chrome_trace(events, path)
+        return events
+
+    def span(self, name, **args):
+        """
+        Context manager recording a span around a block of code.
+
+        :param name: The span name.
+        :param args: Extra arguments attached to the span.
+        :return: A context manager.
+        """
+        run = _current_trace.get()
+        if run is None:
+            return _NULL_SPAN
+        return self._record(run, name, args)
+
+    def trace(self, name=None):
+        """
+        Decorator recording a span around each call of a sync or async function.
+
+        :param name: The span name, defaults to the function's qualified name.
+        :return: The decorator.
+        """
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    run = _current_trace.get()
+                    if run is None:
+                        return await func(*args, **kwargs)
+                    with self._record(run, span_name, {}):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                run = _current_trace.get()
+                if run is None:
+                    return func(*args, **kwargs)
+                with self._record(run, span_name, {}):
+                    return func(*args, **kwargs)
+            return wrapper
+
+        return decorator
+
+    def export_chrome_trace(self, events, path):
+        """
+        Write trace events to a Chrome trace-event JSON file.
+
+        :param events: The recorded trace events.
+        :param path: The output file path.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace_file, default=str)
+
+    @contextmanager
+    def _record(self, run, name, args):
+        """
+        Record a complete ('X') trace event around the managed block.
+
+        :param run: The traced run.
+        :param name: The span name.
+        :param args: Extra arguments attached to the span.
+        """
+        start = time.monotonic_ns()
+        try:
+            yield
+        finally:
+            end = time.monotonic_ns()
+            run["events"].append({
+                "name": name,
+                "ph": "X",
+                "ts": start / 1000,  # Chrome expects microseconds
+                "dur": (end - start) / 1000,
+                "pid": self.pid,
+                "tid": self._get_track_id(run["tracks"]),
+                "args": args,
+            })
+
+    def _get_track_id(self, tracks):
+        """
+        Get the trace track of the caller: one per asyncio task, so interleaved
+        tasks do not break span nesting, otherwise one per thread.
+
+        :param tracks: The run's task to track id mapping.
+        :return: Integer track id.
+        """
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is None:
+            return threading.get_ident()
+        return tracks.setdefault(id(task), len(tracks) + 1)
+
+
+# Process-wide tracer
+tracer = Tracer()
@@ -17,7 +17,7 @@ class LogLevel(Enum):
 
 
 # Function to get a logger
-def get_logger(name: str, log_level: LogLevel.value = LogLevel.INFO) -> logging.Logger:
+def get_logger(name: str, log_level: LogLevel = LogLevel.INFO) -> logging.Logger:
     """
     Get a logger with the specified name and configure it.
 
@@ -29,5 +29,5 @@ def get_logger(name: str, log_level: LogLevel.value = LogLevel.INFO) -> logging.
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     handler.setFormatter(formatter)
     logger.addHandler(handler)
-    logger.setLevel(log_level)
+    logger.setLevel(log_level.value)
     return logger
@@ -0,0 +1,145 @@
+"""Action dispatcher tests"""
+
+# Standard library imports
+import asyncio
+import logging
+
+# Third-party library imports
+from src.app.utils.action_dispatcher import ActionBatch, ActionDispatcher, LoggingActionSink, action_dispatcher
+from src.shared_utils.config import get_config
+
+
+class FailingSink(LoggingActionSink):
+    """Sink failing the first `failures` deliveries."""
+
+    def __init__(self, failures):
+        """
+        :param failures: Number of deliveries to fail before succeeding.
+        """
+        super().__init__()
+        self.failures = failures
+
+    async def deliver(self, action, facts):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("sink unavailable")
+        await super().deliver(action, facts)
+
+
+class HangingSink(LoggingActionSink):
+    """Sink never completing a delivery."""
+
+    async def deliver(self, action, facts):
+        await asyncio.sleep(3600)
+
+
+def deliver(dispatcher, batch):
+    """
+    Dispatch a batch and wait for its delivery on a fresh event loop.
+
+    :param dispatcher: The dispatcher.
+    :param batch: The batch to deliver.
+    """
+    async def run():
+        dispatcher.dispatch(batch)
+        await dispatcher.drain()
+
+    asyncio.run(run())
+
+
+def test_batch_coalesces_actions_by_key():
+    batch = ActionBatch()
+    for fact_id in range(1, 4):
+        batch.submit({"type": "alert", "message": "Pacing too low"}, {"id": fact_id})
+    batch.submit({"type": "alert", "message": "Goal reached"}, {"id": 4})
+    batch.submit({"type": "notify", "recipient": "ops", "template": "t"}, {"id": 1})
+    batch.submit({"type": "notify", "recipient": "ops", "template": "t"}, {"id": 2})
+    batch.submit({"type": "redistribute", "params": {"a": 1, "b": 2}}, {"id": 1})
+    batch.submit({"type": "redistribute", "params": {"b": 2, "a": 1}}, {"id": 2})
+
+    facts = {key: [fact["id"] for fact in digest["facts"]] for key, digest in batch.digests.items()}
+    assert facts == {
+        ("alert", "Pacing too low"): [1, 2, 3],
+        ("alert", "Goal reached"): [4],
+        ("notify", "ops", "t"): [1, 2],
+        ("redistribute", '{"a": 1, "b": 2}'): [1, 2],
+    }
+
+
+def test_batch_keeps_every_action_beyond_the_queue_size():
+    batch = ActionBatch()
+    for fact_id in range(50000):
+        batch.submit({"type": "alert", "message": "Pacing too low"}, {"id": fact_id})
+
+    assert len(batch.digests) == 1
+    assert len(batch.digests[("alert", "Pacing too low")]["facts"]) == 50000
+
+
+def test_dispatch_delivers_one_digest_per_key():
+    dispatcher = ActionDispatcher(max_deliveries_per_second=0)
+    batch = ActionBatch()
+    for fact_id in range(10):
+        batch.submit({"type": "alert", "message": f"m{fact_id % 2}"}, {"id": fact_id})
+
+    deliver(dispatcher, batch)
+
+    assert sorted((action["message"], len(facts)) for action, facts in dispatcher.sink.deliveries) == [
+        ("m0", 5), ("m1", 5)]
+    assert batch.digests == {}
+
+
+def test_dispatch_counts_dropped_actions_once(caplog):
+    dispatcher = ActionDispatcher(max_queue_size=1, max_deliveries_per_second=0)
+    batch = ActionBatch()
+    for fact_id in range(9):
+        batch.submit({"type": "alert", "message": f"m{fact_id % 3}"}, {"id": fact_id})
+
+    with caplog.at_level(logging.WARNING):
+        deliver(dispatcher, batch)
+
+    assert len(dispatcher.sink.deliveries) == 1
+    warnings = [record.getMessage() for record in caplog.records if record.levelno == logging.WARNING]
+    assert warnings == ["Dropped 6 actions because the delivery queue was full."]
+
+
+def test_failed_delivery_is_retried():
+    dispatcher = ActionDispatcher(sink=FailingSink(failures=2), max_deliveries_per_second=0, retry_backoff=0)
+    batch = ActionBatch()
+    batch.submit({"type": "alert", "message": "Pacing too low"}, {"id": 1})
+
+    deliver(dispatcher, batch)
+
+    assert [action["message"] for action, _ in dispatcher.sink.deliveries] == ["Pacing too low"]
+
+
+def test_dispatcher_restarts_on_a_new_event_loop():
+    dispatcher = ActionDispatcher(max_deliveries_per_second=0)
+    for message in ("first", "second"):
+        batch = ActionBatch()
+        batch.submit({"type": "alert", "message": message}, {"id": 1})
+        deliver(dispatcher, batch)
+
+    assert [action["message"] for action, _ in dispatcher.sink.deliveries] == ["first", "second"]
+
+
+def test_drain_abandons_the_digests_left_after_the_timeout(caplog):
+    dispatcher = ActionDispatcher(sink=HangingSink(), max_deliveries_per_second=0, drain_timeout=0.05)
+    batch = ActionBatch()
+    for message in ("m0", "m1", "m2"):
+        batch.submit({"type": "alert", "message": message}, {"id": 1})
+
+    with caplog.at_level(logging.WARNING):
+        deliver(dispatcher, batch)
+
+    assert dispatcher.worker is None
+    warnings = [record.getMessage() for record in caplog.records if record.levelno == logging.WARNING]
+    assert warnings == ["Abandoned 3 action digests still undelivered after 0.05s."]
+
+
+def test_process_dispatcher_reads_the_actions_configuration():
+    actions_config = get_config("actions")
+
+    assert action_dispatcher.max_queue_size == actions_config["max_queue_size"]
+    assert action_dispatcher.max_retries == actions_config["max_retries"]
+    assert action_dispatcher.min_delivery_interval == 1.0 / actions_config["max_deliveries_per_second"]
+    assert action_dispatcher.drain_timeout == actions_config["drain_timeout_seconds"]
@@ -0,0 +1,32 @@
+"""Fact model tests"""
+
+# Third-party library imports
+import pytest
+from pydantic import ValidationError
+from src.app.model.fact import load_facts
+
+
+def test_load_facts_coerces_types_and_applies_defaults():
+    facts = load_facts([{"id": "1", "campaign_id": 2, "pacing_osi": 12, "impressions_delivered": "300"}])
+
+    assert facts[0]["id"] == 1
+    assert facts[0]["impressions_delivered"] == 300
+    assert facts[0]["pacing_osi"] == 12.0 and isinstance(facts[0]["pacing_osi"], float)
+    assert facts[0]["campaign_name"] == ""
+    assert facts[0]["delivery_type"] is None
+
+
+def test_load_facts_keeps_extra_fields():
+    facts = load_facts([{"id": 1, "campaign_id": 2, "budget": {"daily": 10}}])
+
+    assert facts[0]["budget"] == {"daily": 10}
+
+
+@pytest.mark.parametrize("record", [
+    {"campaign_id": 2},
+    {"id": 1},
+    {"id": 1, "campaign_id": 2, "impression_goal": "many"},
+])
+def test_load_facts_rejects_invalid_records(record):
+    with pytest.raises(ValidationError):
+        load_facts([record])
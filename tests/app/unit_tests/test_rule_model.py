@@ -0,0 +1,97 @@
+"""Rule model tests"""
+
+# Third-party library imports
+import pytest
+from pydantic import ValidationError
+from src.app.model.rule import RuleDefinition
+
+
+def make_rule(**overrides):
+    """
+    Build a valid raw rule definition.
+
+    :param overrides: Keys replacing the defaults.
+    :return: A raw rule definition.
+    """
+    rule = {
+        "name": "low_pacing",
+        "condition": {"all": [{"field": "pacing_osi", "operator": "<", "value": 50}]},
+        "actions": [{"type": "alert", "message": "Pacing too low"}],
+    }
+    rule.update(overrides)
+    return rule
+
+
+def test_to_rule_keeps_explicit_null_values():
+    rule = make_rule(condition={"any": [{"field": "delivery_type", "operator": "==", "value": None}]})
+
+    dumped = RuleDefinition.model_validate(rule).to_rule()
+
+    assert dumped["condition"] == {"any": [{"field": "delivery_type", "operator": "==", "value": None}]}
+
+
+def test_to_rule_drops_the_unused_condition_group_and_unset_fields():
+    rule = make_rule(condition={"all": None, "any": [{"field": "pacing_osi", "operator": "<", "value": 50}]})
+
+    dumped = RuleDefinition.model_validate(rule).to_rule()
+
+    assert list(dumped["condition"]) == ["any"]
+    assert dumped["actions"] == [{"type": "alert", "message": "Pacing too low"}]
+    assert "priority" not in dumped and "aggregates" not in dumped
+
+
+@pytest.mark.parametrize("condition", [
+    {"all": [{"field": "a", "operator": "==", "value": 1}], "any": [{"field": "b", "operator": "==", "value": 1}]},
+    {},
+    {"all": []},
+])
+def test_condition_needs_exactly_one_non_empty_group(condition):
+    with pytest.raises(ValidationError):
+        RuleDefinition.model_validate(make_rule(condition=condition))
+
+
+def test_condition_operator_is_checked():
+    with pytest.raises(ValidationError):
+        RuleDefinition.model_validate(make_rule(condition={"all": [{"field": "a", "operator": "=~", "value": 1}]}))
+
+
+@pytest.mark.parametrize("action, missing", [
+    ({"type": "update", "expression": "1"}, "target_field"),
+    ({"type": "update", "target_field": "pacing_osi"}, "expression"),
+    ({"type": "redistribute"}, "params"),
+    ({"type": "alert"}, "message"),
+    ({"type": "notify", "recipient": "ops"}, "template"),
+])
+def test_actions_require_their_fields(action, missing):
+    with pytest.raises(ValidationError, match=missing):
+        RuleDefinition.model_validate(make_rule(actions=[action]))
+
+
+def test_unknown_action_type_is_rejected():
+    with pytest.raises(ValidationError):
+        RuleDefinition.model_validate(make_rule(actions=[{"type": "email", "message": "m"}]))
+
+
+def test_invalid_update_expression_is_rejected():
+    action = {"type": "update", "target_field": "pacing_osi", "expression": "pacing_osi +"}
+
+    with pytest.raises(ValidationError, match="Invalid update expression"):
+        RuleDefinition.model_validate(make_rule(actions=[action]))
+
+
+@pytest.mark.parametrize("aggregate", [
+    {"name": "total", "function": "sum", "group_by": "campaign_id"},
+    {"name": "total", "function": "median", "field": "impressions_delivered", "group_by": "campaign_id"},
+    {"name": "total", "function": "sum", "field": "impressions_delivered", "group_by": "line_id"},
+])
+def test_invalid_aggregates_are_rejected(aggregate):
+    with pytest.raises(ValidationError):
+        RuleDefinition.model_validate(make_rule(aggregates=[aggregate]))
+
+
+def test_count_aggregate_needs_no_field():
+    aggregate = {"name": "lines", "function": "count", "group_by": "order_id"}
+
+    dumped = RuleDefinition.model_validate(make_rule(aggregates=[aggregate])).to_rule()
+
+    assert dumped["aggregates"] == [aggregate]
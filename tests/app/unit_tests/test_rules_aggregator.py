@@ -0,0 +1,94 @@
+"""Rules aggregator tests"""
+
+# Third-party library imports
+import pytest
+from src.app.utils.rules_aggregator import RulesAggregator
+
+FACTS = [
+    {"id": 1, "campaign_id": 1, "order_id": 10, "impressions_delivered": 100},
+    {"id": 2, "campaign_id": 1, "order_id": 11, "impressions_delivered": 300},
+    {"id": 3, "campaign_id": 2, "order_id": 11, "impressions_delivered": None},
+]
+
+
+def make_facts():
+    """
+    :return: A fresh copy of FACTS.
+    """
+    return [dict(fact) for fact in FACTS]
+
+
+@pytest.mark.parametrize("function, expected", [
+    ("sum", [400, 400, None]),
+    ("avg", [200, 200, None]),
+    ("min", [100, 100, None]),
+    ("max", [300, 300, None]),
+])
+def test_aggregates_are_grouped(function, expected):
+    facts = make_facts()
+    aggregates = [{"name": "value", "function": function, "field": "impressions_delivered", "group_by": "campaign_id"}]
+
+    RulesAggregator().attach_aggregates(facts, aggregates)
+
+    assert [fact["aggregates"]["value"] for fact in facts] == expected
+
+
+def test_count_does_not_need_a_field():
+    facts = make_facts()
+
+    RulesAggregator().attach_aggregates(facts, [{"name": "lines", "function": "count", "group_by": "order_id"}])
+
+    assert [fact["aggregates"]["lines"] for fact in facts] == [1, 2, 2]
+
+
+def test_aggregates_read_dotted_fields():
+    facts = [
+        {"id": 1, "campaign_id": 1, "budget": {"daily": 10}},
+        {"id": 2, "campaign_id": 1, "budget": {"daily": 5}},
+        {"id": 3, "campaign_id": 2, "budget": None},
+    ]
+    aggregates = [{"name": "daily", "function": "sum", "field": "budget.daily", "group_by": "campaign_id"}]
+
+    RulesAggregator().attach_aggregates(facts, aggregates)
+
+    assert [fact["aggregates"]["daily"] for fact in facts] == [15, 15, None]
+
+
+def test_collect_aggregates_deduplicates_and_keeps_the_first_definition():
+    aggregate = {"name": "lines", "function": "count", "group_by": "order_id"}
+    rules = [{"rule": {"aggregates": [aggregate]}}, {"rule": {"aggregates": [dict(aggregate)]}}, {"rule": {}}]
+    aggregator = RulesAggregator()
+
+    assert aggregator.collect_aggregates(rules) == [aggregate]
+
+    rules.append({"rule": {"aggregates": [dict(aggregate, group_by="campaign_id")]}})
+    assert aggregator.collect_aggregates(rules) == [aggregate]
+
+
+def test_refreshing_some_aggregates_keeps_the_others():
+    facts = make_facts()
+    total = {"name": "total", "function": "sum", "field": "impressions_delivered", "group_by": "campaign_id"}
+    lines = {"name": "lines", "function": "count", "group_by": "campaign_id"}
+    aggregator = RulesAggregator()
+    aggregator.attach_aggregates(facts, [total, lines])
+
+    facts[0]["impressions_delivered"] = 1000
+    aggregator.attach_aggregates(facts, aggregator.get_affected_aggregates([total, lines], {"impressions_delivered"}))
+
+    assert facts[0]["aggregates"] == {"total": 1300, "lines": 2}
+
+
+def test_affected_aggregates_follow_field_and_group_by():
+    total = {"name": "total", "function": "sum", "field": "impressions_delivered", "group_by": "campaign_id"}
+    lines = {"name": "lines", "function": "count", "group_by": "order_id"}
+    aggregator = RulesAggregator()
+
+    assert aggregator.get_affected_aggregates([total, lines], {"impressions_delivered"}) == [total]
+    assert aggregator.get_affected_aggregates([total, lines], {"order_id"}) == [lines]
+    assert aggregator.get_affected_aggregates([total, lines], {"pacing_osi"}) == []
+
+
+def test_affected_aggregates_match_dotted_fields_on_their_top_level_field():
+    daily = {"name": "daily", "function": "sum", "field": "budget.daily", "group_by": "campaign_id"}
+
+    assert RulesAggregator().get_affected_aggregates([daily], {"budget"}) == [daily]
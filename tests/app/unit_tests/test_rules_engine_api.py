@@ -0,0 +1,57 @@
+"""Rule engine API tests"""
+
+# Third-party library imports
+from src.app.router.rules_engine_api import _validate_rules
+
+
+def make_row(rule_id, name, aggregates=None, actions=None):
+    """
+    Build a rule_definitions row.
+
+    :param rule_id: Row id.
+    :param name: Rule name.
+    :param aggregates: Aggregate definitions of the rule.
+    :param actions: Actions of the rule.
+    :return: A rule_definitions row.
+    """
+    rule = {
+        "name": name,
+        "condition": {"all": [{"field": "pacing_osi", "operator": "<", "value": 50}]},
+        "actions": actions or [{"type": "alert", "message": name}],
+    }
+    if aggregates is not None:
+        rule["aggregates"] = aggregates
+    return {"id": rule_id, "type": name, "rule": rule}
+
+
+def names(rows):
+    """
+    :param rows: Validated rows.
+    :return: The rule names.
+    """
+    return [row["rule"]["name"] for row in rows]
+
+
+def test_invalid_rules_are_skipped():
+    rows = [make_row(1, "valid"), make_row(2, "invalid", actions=[{"type": "alert"}])]
+
+    assert names(_validate_rules(rows)) == ["valid"]
+
+
+def test_rules_redefining_an_aggregate_differently_are_skipped():
+    total = {"name": "tot", "function": "sum", "field": "impressions_delivered", "group_by": "campaign_id"}
+    rows = [
+        make_row(1, "sum_rule", aggregates=[total]),
+        make_row(2, "max_rule", aggregates=[dict(total, function="max")]),
+        make_row(3, "same_rule", aggregates=[dict(total)]),
+        make_row(4, "unrelated"),
+    ]
+
+    assert names(_validate_rules(rows)) == ["sum_rule", "same_rule", "unrelated"]
+
+
+def test_rule_with_conflicting_aggregates_of_its_own_is_skipped():
+    total = {"name": "tot", "function": "sum", "field": "impressions_delivered", "group_by": "campaign_id"}
+    rows = [make_row(1, "conflicting", aggregates=[total, dict(total, group_by="order_id")]), make_row(2, "unrelated")]
+
+    assert names(_validate_rules(rows)) == ["unrelated"]
@@ -0,0 +1,158 @@
+"""Rules scheduler tests"""
+
+# Standard library imports
+import logging
+
+# Third-party library imports
+import pytest
+from src.app.utils import rules_scheduler
+from src.app.utils.rules_scheduler import RulesScheduler
+
+
+def make_rule(name, reads=(), writes=(), priority=0):
+    """
+    Build a rule reading the given fields in its condition and updating the given fields.
+
+    :param name: Rule name.
+    :param reads: Fields read by the condition.
+    :param writes: Fields written by update actions.
+    :param priority: Rule priority.
+    :return: A rule_definitions row.
+    """
+    return {"rule": {
+        "name": name,
+        "priority": priority,
+        "condition": {"all": [{"field": field, "operator": ">", "value": 0} for field in reads]},
+        "actions": [{"type": "update", "target_field": field, "expression": "1"} for field in writes],
+    }}
+
+
+def stage_names(stages):
+    """
+    :param stages: Stages returned by build_stages.
+    :return: The rule names of each stage.
+    """
+    return [[rule["rule"]["name"] for rule in stage] for stage in stages]
+
+
+@pytest.fixture(autouse=True)
+def reset_reported_cycles():
+    """Each test starts with no cycle reported yet."""
+    rules_scheduler._reported_cycles.clear()  # pylint: disable=protected-access
+
+
+def test_chain_runs_one_rule_per_stage():
+    rules = [
+        make_rule("c", reads=["y"]),
+        make_rule("b", reads=["x"], writes=["y"]),
+        make_rule("a", reads=["pacing_osi"], writes=["x"]),
+    ]
+
+    assert stage_names(RulesScheduler().build_stages(rules)) == [["a"], ["b"], ["c"]]
+
+
+def test_independent_rules_share_a_stage_sorted_by_priority():
+    rules = [
+        make_rule("low", reads=["x"], writes=["y"], priority=5),
+        make_rule("high", reads=["x"], writes=["z"], priority=1),
+    ]
+
+    assert stage_names(RulesScheduler().build_stages(rules)) == [["high", "low"]]
+
+
+def test_nested_paths_overlap_with_their_prefix():
+    rules = [
+        make_rule("reader", reads=["budget.daily"]),
+        make_rule("writer", writes=["budget"]),
+    ]
+
+    assert stage_names(RulesScheduler().build_stages(rules)) == [["writer"], ["reader"]]
+
+
+def test_update_expression_names_are_reads():
+    rules = [
+        {"rule": {
+            "name": "reader",
+            "condition": {"all": [{"field": "pacing_osi", "operator": ">", "value": 0}]},
+            "actions": [{"type": "update", "target_field": "y", "expression": "x * 2"}],
+        }},
+        make_rule("writer", writes=["x"]),
+    ]
+
+    assert stage_names(RulesScheduler().build_stages(rules)) == [["writer"], ["reader"]]
+
+
+def test_self_read_is_not_a_dependency(caplog):
+    rules = [make_rule("counter", reads=["x"], writes=["x"])]
+
+    with caplog.at_level(logging.WARNING):
+        stages = RulesScheduler().build_stages(rules)
+
+    assert stage_names(stages) == [["counter"]]
+    assert "cycle" not in caplog.text
+
+
+def test_cycle_is_broken_and_only_its_members_are_reported(caplog):
+    rules = [
+        make_rule("a", reads=["y"], writes=["x"], priority=1),
+        make_rule("b", reads=["x"], writes=["y"], priority=2),
+        make_rule("downstream", reads=["y"]),
+    ]
+
+    with caplog.at_level(logging.WARNING):
+        stages = RulesScheduler().build_stages(rules)
+
+    # Every rule still runs exactly once, the cycle is broken at the lowest priority rule
+    assert stage_names(stages) == [["a"], ["b"], ["downstream"]]
+    warnings = [record.getMessage() for record in caplog.records if record.levelno == logging.WARNING]
+    assert warnings == ["Dependency cycle detected among rules: ['a', 'b']"]
+
+
+def test_cycle_is_reported_once(caplog):
+    rules = [
+        make_rule("a", reads=["y"], writes=["x"]),
+        make_rule("b", reads=["x"], writes=["y"]),
+    ]
+    scheduler = RulesScheduler()
+
+    with caplog.at_level(logging.WARNING):
+        scheduler.build_stages(rules)
+        scheduler.build_stages(rules)
+
+    assert sum("cycle" in record.getMessage() for record in caplog.records) == 1
+
+
+def test_separate_cycles_are_reported_separately(caplog):
+    rules = [
+        make_rule("a", reads=["y"], writes=["x"]),
+        make_rule("b", reads=["x"], writes=["y"]),
+        make_rule("c", reads=["w"], writes=["v"]),
+        make_rule("d", reads=["v"], writes=["w"]),
+    ]
+
+    with caplog.at_level(logging.WARNING):
+        stages = RulesScheduler().build_stages(rules)
+
+    assert sorted(name for stage in stage_names(stages) for name in stage) == ["a", "b", "c", "d"]
+    warnings = sorted(record.getMessage() for record in caplog.records if record.levelno == logging.WARNING)
+    assert warnings == [
+        "Dependency cycle detected among rules: ['a', 'b']",
+        "Dependency cycle detected among rules: ['c', 'd']",
+    ]
+
+
+def test_aggregate_read_depends_on_the_aggregated_field():
+    aggregates = [{"name": "campaign_impressions", "function": "sum",
+                   "field": "impressions_delivered", "group_by": "campaign_id"}]
+    rules = [
+        make_rule("reader", reads=["aggregates.campaign_impressions"]),
+        make_rule("writer", writes=["impressions_delivered"]),
+    ]
+
+    assert stage_names(RulesScheduler().build_stages(rules, aggregates)) == [["writer"], ["reader"]]
+
+
+def test_get_written_fields_returns_top_level_fields():
+    rules = [make_rule("a", writes=["budget.daily"]), make_rule("b", writes=["pacing_osi"])]
+
+    assert RulesScheduler().get_written_fields(rules) == {"budget", "pacing_osi"}
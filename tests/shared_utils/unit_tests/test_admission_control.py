@@ -0,0 +1,76 @@
+"""Admission control tests"""
+
+# Standard library imports
+import asyncio
+
+# Third-party library imports
+import pytest
+from src.shared_utils.admission_control import AdmissionController, AdmissionRejected
+
+
+async def hold(controller, seconds):
+    """
+    Hold an execution slot for `seconds`.
+
+    :param controller: The admission controller.
+    :param seconds: Seconds to hold the slot.
+    :return: True if admitted, False if rejected.
+    """
+    try:
+        async with controller.admit():
+            await asyncio.sleep(seconds)
+        return True
+    except AdmissionRejected:
+        return False
+
+
+def test_requests_beyond_the_queue_are_rejected():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, max_queued=1, queue_timeout=5)
+        results = await asyncio.gather(*[hold(controller, 0.05) for _ in range(3)])
+        return controller, results
+
+    controller, results = asyncio.run(run())
+
+    assert sorted(results) == [False, True, True]
+    assert controller.get_status()["rejected"] == 1
+
+
+def test_queue_timeout_rejects():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, max_queued=1, queue_timeout=0.01)
+        return await asyncio.gather(hold(controller, 0.1), hold(controller, 0))
+
+    assert asyncio.run(run()) == [True, False]
+
+
+def test_timeouts_do_not_leak_permits():
+    async def run():
+        controller = AdmissionController(max_concurrent=2, max_queued=100, queue_timeout=0.005)
+        for _ in range(20):
+            await asyncio.gather(*[hold(controller, 0.005) for _ in range(20)])
+        return controller
+
+    controller = asyncio.run(run())
+
+    status = controller.get_status()
+    assert (status["running"], status["queued"]) == (0, 0)
+    assert controller._semaphore._value == 2  # pylint: disable=protected-access
+
+
+def test_cancelled_wait_does_not_leak_permits():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, max_queued=1, queue_timeout=5)
+        holder = asyncio.create_task(hold(controller, 0.02))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold(controller, 0))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await holder
+        return controller
+
+    controller = asyncio.run(run())
+
+    assert controller._semaphore._value == 1  # pylint: disable=protected-access
@@ -0,0 +1,70 @@
+"""Sampling profiler tests"""
+
+# Standard library imports
+import threading
+import time
+from collections import Counter
+
+# Third-party library imports
+from src.shared_utils.sampling_profiler import SamplingProfiler
+
+
+def busy_wait(stop_event):
+    """
+    Keep a thread busy until `stop_event` is set.
+
+    :param stop_event: Event ending the wait.
+    """
+    while not stop_event.is_set():
+        sum(range(100))
+
+
+def test_every_thread_but_the_sampler_is_sampled():
+    stop_event = threading.Event()
+    worker = threading.Thread(target=busy_wait, args=(stop_event,), name="busy-worker")
+    profiler = SamplingProfiler(interval=0.001)
+
+    worker.start()
+    profiler.start()
+    time.sleep(0.1)
+    profiler.stop()
+    stop_event.set()
+    worker.join()
+
+    roots = {stack[0] for stack in profiler.stacks}
+    assert "thread busy-worker" in roots
+    assert f"thread {threading.current_thread().name}" in roots
+    assert "thread sampling-profiler" not in roots
+    assert any(frame.startswith("busy_wait (") for stack in profiler.stacks for frame in stack)
+
+
+def test_sampling_stops_at_max_samples():
+    profiler = SamplingProfiler(interval=0.001, max_samples=3)
+
+    profiler.start()
+    time.sleep(0.1)
+    profiler.stop()
+
+    assert profiler.samples == 3
+    assert profiler.get_summary()["samples"] == 3
+
+
+def test_collapsed_lists_stacks_by_count():
+    profiler = SamplingProfiler()
+    profiler.stacks = Counter({("thread main", "run"): 1, ("thread main", "run", "fetch"): 3})
+
+    assert profiler.collapsed() == "thread main;run;fetch 3\nthread main;run 1"
+
+
+def test_speedscope_shares_frames_and_weights_samples_by_interval():
+    profiler = SamplingProfiler(interval=0.01)
+    profiler.stacks = Counter({("thread main", "run"): 1, ("thread main", "run", "fetch"): 3})
+
+    profile = profiler.speedscope(name="test")
+
+    assert profile["shared"]["frames"] == [{"name": "thread main"}, {"name": "run"}, {"name": "fetch"}]
+    sampled = profile["profiles"][0]
+    assert sampled["type"] == "sampled" and sampled["name"] == "test" and sampled["unit"] == "seconds"
+    assert sampled["samples"] == [[0, 1], [0, 1, 2]]
+    assert sampled["weights"] == [0.01, 0.03]
+    assert sampled["endValue"] == sum(sampled["weights"])
@@ -0,0 +1,89 @@
+"""Tracer tests"""
+
+# Standard library imports
+import asyncio
+import json
+import os
+
+# Third-party library imports
+from src.shared_utils.tracer import Tracer
+
+
+def test_nothing_is_recorded_without_an_active_run():
+    tracer = Tracer()
+
+    @tracer.trace()
+    def traced():
+        return "result"
+
+    with tracer.span("outside"):
+        assert traced() == "result"
+
+    token = tracer.start_run()
+    events = tracer.finish_run(token)
+
+    assert events == []
+
+
+def test_spans_nest_per_task():
+    tracer = Tracer()
+
+    async def work(name):
+        with tracer.span(f"{name}.outer"):
+            await asyncio.sleep(0.01)
+            with tracer.span(f"{name}.inner"):
+                await asyncio.sleep(0.01)
+
+    async def run():
+        token = tracer.start_run()
+        await asyncio.gather(work("a"), work("b"))
+        return tracer.finish_run(token)
+
+    events = {event["name"]: event for event in asyncio.run(run())}
+
+    assert set(events) == {"a.outer", "a.inner", "b.outer", "b.inner"}
+    assert events["a.outer"]["tid"] != events["b.outer"]["tid"]
+    for name in ("a", "b"):
+        outer, inner = events[f"{name}.outer"], events[f"{name}.inner"]
+        assert inner["tid"] == outer["tid"]
+        assert outer["ts"] <= inner["ts"]
+        assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+
+
+def test_trace_decorator_names_spans_after_the_function():
+    tracer = Tracer()
+
+    @tracer.trace()
+    def sync_step():
+        pass
+
+    @tracer.trace("custom")
+    async def async_step():
+        pass
+
+    token = tracer.start_run()
+    sync_step()
+    asyncio.run(async_step())
+    events = tracer.finish_run(token)
+
+    assert [event["name"] for event in events] == [sync_step.__qualname__, "custom"]
+
+
+def test_finish_run_exports_chrome_trace_events(tmp_path):
+    tracer = Tracer()
+    path = os.path.join(tmp_path, "traces", "run.json")
+
+    token = tracer.start_run()
+    with tracer.span("fetch_data", rows=3):
+        pass
+    tracer.finish_run(token, path)
+
+    with open(path, encoding="utf-8") as trace_file:
+        trace = json.load(trace_file)
+    assert trace["displayTimeUnit"] == "ms"
+    [event] = trace["traceEvents"]
+    assert set(event) == {"name", "ph", "ts", "dur", "pid", "tid", "args"}
+    assert event["name"] == "fetch_data" and event["ph"] == "X"
+    assert event["pid"] == os.getpid()
+    assert event["dur"] >= 0
+    assert event["args"] == {"rows": 3}